@@ -0,0 +1,127 @@
+"""
+Tests of event engine.
+
+Run with: python -m pytest tests
+"""
+
+import unittest
+from time import sleep
+
+from vnpy.event import EventEngine, AsyncEventEngine, ConflatedHandler, Event, EVENT_TIMER
+from vnpy.event.engine import TimerScheduler
+
+
+class TimerSchedulerTest(unittest.TestCase):
+    """"""
+
+    def test_invalid_interval(self) -> None:
+        """
+        Repeating timer without positive interval is rejected.
+        """
+        scheduler: TimerScheduler = TimerScheduler()
+
+        for interval in [0, -1]:
+            with self.assertRaises(ValueError):
+                scheduler.add("x", interval)
+
+        self.assertIsNone(scheduler.get_next_time())
+
+        # One-shot timer may be due immediately
+        scheduler.add("y", 0, False)
+        self.assertEqual(scheduler.pop_due(scheduler.get_next_time()), ["y"])
+
+
+class EventEngineTimerTest(unittest.TestCase):
+    """"""
+
+    def test_invalid_timer(self) -> None:
+        """
+        Invalid timer is rejected without stopping timer thread.
+        """
+        event_engine: EventEngine = EventEngine(0.05)
+
+        events: list = []
+
+        def on_timer(event: Event) -> None:
+            events.append(event)
+
+        event_engine.register(EVENT_TIMER, on_timer)
+        event_engine.start()
+
+        try:
+            with self.assertRaises(ValueError):
+                event_engine.add_timer("x", 0)
+
+            sleep(0.3)
+        finally:
+            event_engine.stop()
+
+        self.assertGreater(len(events), 2)
+
+
+class ConflatedHandlerTest(unittest.TestCase):
+    """"""
+
+    def test_unregister_in_handler(self) -> None:
+        """
+        Conflated handler can unregister itself when called.
+        """
+        event_engine: EventEngine = EventEngine()
+
+        events: list = []
+        errors: list = []
+
+        def on_event(event: Event) -> None:
+            events.append(event.data)
+            try:
+                event_engine.unregister("test", on_event)
+            except Exception as e:
+                errors.append(e)
+
+        conflated_handler: ConflatedHandler = event_engine.register_conflated("test", on_event)
+        event_engine.start()
+
+        try:
+            event_engine.put(Event("test", 1))
+            sleep(0.2)
+            event_engine.put(Event("test", 2))
+            sleep(0.2)
+        finally:
+            event_engine.stop()
+
+        conflated_handler._thread.join(2)
+
+        self.assertEqual(events, [1])
+        self.assertEqual(errors, [])
+        self.assertFalse(conflated_handler._thread.is_alive())
+
+
+class AsyncEventEngineTest(unittest.TestCase):
+    """"""
+
+    def test_put_from_other_thread(self) -> None:
+        """
+        Events put before start and after queue drained are all delivered.
+        """
+        event_engine: AsyncEventEngine = AsyncEventEngine()
+
+        events: list = []
+        event_engine.register("test", lambda event: events.append(event.data))
+
+        event_engine.put(Event("test", 0))
+        event_engine.start()
+
+        try:
+            for i in range(1, 4):
+                sleep(0.1)
+                event_engine.put(Event("test", i))
+
+            sleep(0.1)
+        finally:
+            event_engine.stop()
+
+        self.assertEqual(events, [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
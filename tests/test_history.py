@@ -0,0 +1,58 @@
+"""
+Tests of columnar history containers.
+
+Run with: python -m pytest tests
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import TickData
+from vnpy.trader.history import TickHistory
+from vnpy.trader.archive import to_records
+from vnpy.trader.database import DB_TZ
+
+
+class TickHistoryTest(unittest.TestCase):
+    """"""
+
+    def setUp(self) -> None:
+        """"""
+        start: datetime = datetime(2024, 1, 2, 9, 30, tzinfo=DB_TZ)
+
+        ticks: list = [
+            TickData(
+                symbol="test",
+                exchange=Exchange.LOCAL,
+                datetime=start + timedelta(seconds=i),
+                last_price=100 + i,
+                gateway_name="DB"
+            )
+            for i in range(3)
+        ]
+        self.history: TickHistory = TickHistory("test", Exchange.LOCAL, "", to_records(ticks), DB_TZ)
+
+    def test_index(self) -> None:
+        """
+        Integer index works like list, including negative index.
+        """
+        self.assertEqual(self.history[0].last_price, 100)
+        self.assertEqual(self.history[2].last_price, 102)
+        self.assertEqual(self.history[-1].last_price, 102)
+        self.assertEqual(self.history[-3].last_price, 100)
+
+    def test_index_out_of_range(self) -> None:
+        """
+        Index out of range raises IndexError.
+        """
+        for index in [3, 10, -4]:
+            with self.assertRaises(IndexError):
+                self.history[index]
+
+        with self.assertRaises(IndexError):
+            self.history[1:1][0]
+
+
+if __name__ == "__main__":
+    unittest.main()
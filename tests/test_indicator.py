@@ -0,0 +1,172 @@
+"""
+Parity of streaming indicators with TA-Lib.
+
+Run with: python -m pytest tests
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import talib
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager
+from vnpy.trader.indicator import (
+    StreamIndicator,
+    SmaIndicator,
+    EmaIndicator,
+    StdIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    MaxIndicator,
+    MinIndicator
+)
+
+
+# Sliding window ones match TA-Lib up to float rounding of running sums.
+WINDOW_TOLERANCE: float = 1e-9
+
+# Standard deviation is taken from running sum of squares, in which
+# rounding error of price level (~1e3) squared shows up in small values.
+STD_TOLERANCE: float = 1e-7
+
+# Recursive ones (EMA/ATR/RSI) follow the same seeding as TA-Lib, so fed
+# with the same whole series they only differ in rounding order.
+RECURSIVE_TOLERANCE: float = 1e-8
+
+# ArrayManager calls TA-Lib on its fixed size window, which re-seeds the
+# recursive indicators from window start on every call, while streaming
+# ones keep the whole history. With size=300 and n<=30 the seed weight
+# left is below (1 - 1/30) ** 270, about 1e-4 of the seed error.
+ARRAY_MANAGER_TOLERANCE: float = 1e-3
+
+
+def generate_prices(count: int, seed: int = 0) -> tuple:
+    """
+    Generate random walk high/low/close prices.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+
+    close: np.ndarray = 1000 + np.cumsum(rng.normal(0, 5, count))
+    high: np.ndarray = close + rng.uniform(0, 5, count)
+    low: np.ndarray = close - rng.uniform(0, 5, count)
+    return high, low, close
+
+
+def run_stream(indicator: StreamIndicator, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Feed prices bar by bar and collect value after each bar.
+    """
+    values: list = []
+    for h, l, c in zip(high.tolist(), low.tolist(), close.tolist()):
+        indicator.update(h, l, c)
+        values.append(indicator.value)
+    return np.array(values)
+
+
+class StreamIndicatorTest(unittest.TestCase):
+    """"""
+
+    def setUp(self) -> None:
+        """"""
+        self.high, self.low, self.close = generate_prices(2000)
+
+    def assert_parity(self, indicator: StreamIndicator, expected: np.ndarray, tolerance: float) -> None:
+        """
+        Values must be nan at the same bars as TA-Lib and close elsewhere.
+        """
+        result: np.ndarray = run_stream(indicator, self.high, self.low, self.close)
+
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+
+        valid: np.ndarray = ~np.isnan(expected)
+        np.testing.assert_allclose(result[valid], expected[valid], rtol=0, atol=tolerance)
+
+    def test_sma(self) -> None:
+        """"""
+        for n in [1, 5, 20, 60]:
+            self.assert_parity(SmaIndicator(n), talib.SMA(self.close, n), WINDOW_TOLERANCE)
+
+    def test_std(self) -> None:
+        """"""
+        for n in [5, 20, 60]:
+            self.assert_parity(StdIndicator(n), talib.STDDEV(self.close, n), STD_TOLERANCE)
+
+    def test_max_min(self) -> None:
+        """"""
+        for n in [2, 5, 20, 60]:
+            self.assert_parity(MaxIndicator(n), talib.MAX(self.high, n), 0)
+            self.assert_parity(MinIndicator(n), talib.MIN(self.low, n), 0)
+
+    def test_ema(self) -> None:
+        """"""
+        for n in [2, 12, 26]:
+            self.assert_parity(EmaIndicator(n), talib.EMA(self.close, n), RECURSIVE_TOLERANCE)
+
+    def test_atr(self) -> None:
+        """"""
+        for n in [1, 14, 30]:
+            expected: np.ndarray = talib.ATR(self.high, self.low, self.close, n)
+            self.assert_parity(AtrIndicator(n), expected, RECURSIVE_TOLERANCE)
+
+    def test_rsi(self) -> None:
+        """"""
+        for n in [6, 14, 30]:
+            self.assert_parity(RsiIndicator(n), talib.RSI(self.close, n), RECURSIVE_TOLERANCE)
+
+
+class ArrayManagerIncrementalTest(unittest.TestCase):
+    """"""
+
+    def test_latest_value(self) -> None:
+        """
+        Incremental ArrayManager result matches TA-Lib on its window after
+        every bar once inited.
+        """
+        high, low, close = generate_prices(1000, seed=1)
+
+        am: ArrayManager = ArrayManager(300, incremental=True)
+        reference: ArrayManager = ArrayManager(300)
+
+        start: datetime = datetime(2024, 1, 1)
+        checked: int = 0
+
+        for i, (h, l, c) in enumerate(zip(high.tolist(), low.tolist(), close.tolist())):
+            bar: BarData = BarData(
+                symbol="test",
+                exchange=Exchange.LOCAL,
+                datetime=start + timedelta(minutes=i),
+                interval=Interval.MINUTE,
+                open_price=c,
+                high_price=h,
+                low_price=l,
+                close_price=c,
+                gateway_name="TEST"
+            )
+            am.update_bar(bar)
+            reference.update_bar(bar)
+
+            if not am.inited:
+                continue
+
+            for name, args, tolerance in [
+                ("sma", (20,), WINDOW_TOLERANCE),
+                ("std", (20,), STD_TOLERANCE),
+                ("ema", (26,), ARRAY_MANAGER_TOLERANCE),
+                ("atr", (14,), ARRAY_MANAGER_TOLERANCE),
+                ("rsi", (14,), ARRAY_MANAGER_TOLERANCE),
+            ]:
+                value: float = getattr(am, name)(*args)
+                expected: float = getattr(reference, name)(*args)
+                self.assertAlmostEqual(value, expected, delta=tolerance, msg=f"{name}{args} at bar {i}")
+
+            self.assertEqual(am.donchian(20), reference.donchian(20))
+            checked += 1
+
+        self.assertEqual(checked, 1000 - 299)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,17 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    PriorityEventEngine,
+    ShardedEventEngine,
+    AsyncEventEngine,
+    EventConflator,
+    ConflatedHandler,
+    get_event_key,
+    get_shard_key,
+    EVENT_TIMER,
+    EVENT_PROFILE,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW
+)
+from .profiler import EventProfiler, LatencyHistogram
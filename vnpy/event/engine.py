@@ -2,13 +2,24 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
+import asyncio
+import heapq
+from collections import defaultdict, deque
+from datetime import datetime
+from inspect import isawaitable
 from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable, List
+from threading import Condition, Thread, current_thread, get_ident
+from time import monotonic, perf_counter, time
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from .profiler import EventProfiler
 
 EVENT_TIMER = "eTimer"
+EVENT_PROFILE = "eProfile"
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
 
 
 class Event:
@@ -27,6 +38,219 @@ class Event:
 # Defines handler function to be used in event engine.
 HandlerType: callable = Callable[[Event], None]
 
+# Defines function to get conflation key of event.
+KeyFuncType: callable = Callable[[Event], Hashable]
+
+
+def get_shard_key(event: Event) -> Hashable:
+    """
+    Default shard key of event: vt_symbol of data.
+    """
+    return getattr(event.data, "vt_symbol", None)
+
+
+def get_event_key(event: Event) -> Hashable:
+    """
+    Default conflation key of event: type + vt_symbol of data.
+    """
+    return (event.type, getattr(event.data, "vt_symbol", None))
+
+
+class EventConflator:
+    """
+    Keep only the latest event of each key before consumed.
+
+    Producer puts events in, and consumer gets all pending events out
+    when ready. If a newer event of the same key arrives before the old
+    one is consumed, the old one is replaced and counted as dropped.
+    """
+
+    def __init__(self, key_func: KeyFuncType = get_event_key) -> None:
+        """"""
+        self._key_func: KeyFuncType = key_func
+        self._pending: Dict[Hashable, Event] = {}
+        self._condition: Condition = Condition()
+
+        self.received: int = 0
+        self.dropped: int = 0
+
+    def put(self, event: Event) -> bool:
+        """
+        Put event into pending dict, return True if it was empty before,
+        which means consumer should be notified.
+        """
+        key: Hashable = self._key_func(event)
+
+        with self._condition:
+            pending: Dict[Hashable, Event] = self._pending
+            empty: bool = not pending
+
+            self.received += 1
+            if key in pending:
+                self.dropped += 1
+            pending[key] = event
+
+            self._condition.notify()
+
+        return empty
+
+    def get_all(self) -> List[Event]:
+        """
+        Get all pending events in order of first arrival of each key.
+        """
+        with self._condition:
+            events: List[Event] = list(self._pending.values())
+            self._pending = {}
+
+        return events
+
+    def qsize(self) -> int:
+        """
+        Number of pending events.
+        """
+        return len(self._pending)
+
+
+class ConflatedHandler(EventConflator):
+    """
+    Handler wrapper which runs the wrapped handler in its own thread, so
+    that a slow handler only sees the latest event of each key and never
+    blocks the event engine.
+    """
+
+    def __init__(self, handler: HandlerType, key_func: KeyFuncType = get_event_key) -> None:
+        """"""
+        super().__init__(key_func)
+
+        self.handler: HandlerType = handler
+
+        self._active: bool = False
+        self._thread: Thread = Thread(target=self._run, daemon=True)
+
+    def __call__(self, event: Event) -> None:
+        """
+        Called by event engine.
+        """
+        self.put(event)
+
+    def _run(self) -> None:
+        """
+        Wait for pending events and then process them.
+        """
+        while self._active:
+            with self._condition:
+                if not self._pending:
+                    self._condition.wait(1)
+
+            for event in self.get_all():
+                self.handler(event)
+
+    def start(self) -> None:
+        """
+        Start handler thread.
+        """
+        self._active = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop handler thread, which exits after current events processed
+        if stopped from inside the handler.
+        """
+        self._active = False
+
+        if current_thread() is not self._thread:
+            self._thread.join()
+
+
+def get_timer_type(name: str) -> str:
+    """
+    Event type of named timer.
+    """
+    return f"{EVENT_TIMER}.{name}"
+
+
+class TimerScheduler:
+    """
+    Schedule of multiple named timers based on monotonic clock.
+
+    Repeating timers are scheduled on fixed time grid from their start,
+    so processing time does not accumulate into drift. If the schedule
+    falls behind for more than one period, missed periods are skipped
+    instead of fired in a burst.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self._timers: Dict[str, Tuple[float, bool, float, int]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._count: int = 0
+
+    def add(self, name: str, interval: float, repeat: bool = True) -> None:
+        """
+        Add timer firing after interval seconds, and then every interval
+        seconds if repeat. Timer with the same name is replaced.
+        """
+        if repeat and interval <= 0:
+            raise ValueError(f"Interval of repeating timer must be positive: {interval}")
+
+        self._count += 1
+        deadline: float = monotonic() + interval
+
+        self._timers[name] = (interval, repeat, deadline, self._count)
+        heapq.heappush(self._heap, (deadline, self._count, name))
+
+    def remove(self, name: str) -> None:
+        """
+        Remove timer, its entry in heap is skipped when popped.
+        """
+        self._timers.pop(name, None)
+
+    def pop_due(self, now: float) -> List[str]:
+        """
+        Get names of timers due at now, and schedule their next deadlines.
+        """
+        names: List[str] = []
+        heap: List[Tuple[float, int, str]] = self._heap
+
+        while heap and heap[0][0] <= now:
+            deadline, count, name = heapq.heappop(heap)
+
+            timer: Optional[Tuple[float, bool, float, int]] = self._timers.get(name, None)
+            if not timer or timer[3] != count:
+                continue
+            names.append(name)
+
+            interval, repeat, _, _ = timer
+            if not repeat:
+                self._timers.pop(name)
+                continue
+
+            deadline += interval
+            if deadline <= now:
+                deadline += ((now - deadline) // interval + 1) * interval
+
+            self._timers[name] = (interval, repeat, deadline, count)
+            heapq.heappush(heap, (deadline, count, name))
+
+        return names
+
+    def get_next_time(self) -> Optional[float]:
+        """
+        Get the nearest deadline, or None if no timer.
+        """
+        heap: List[Tuple[float, int, str]] = self._heap
+
+        # Remove entries of timers already removed or replaced
+        while heap:
+            deadline, count, name = heap[0]
+            timer: Optional[Tuple[float, bool, float, int]] = self._timers.get(name, None)
+            if timer and timer[3] == count:
+                return deadline
+            heapq.heappop(heap)
+
+        return None
+
 
 class EventEngine:
     """
@@ -34,21 +258,33 @@ class EventEngine:
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. Additional named timers with
+    independent (sub-second) periods or one-shot deadlines can be added,
+    which generate timer events of type "eTimer.<name>".
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(self, interval: float = 1) -> None:
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
         """
-        self._interval: int = interval
+        self._interval: float = interval
         self._queue: Queue = Queue()
         self._active: bool = False
         self._thread: Thread = Thread(target=self._run)
         self._timer: Thread = Thread(target=self._run_timer)
         self._handlers: defaultdict = defaultdict(list)
         self._general_handlers: List = []
+        self._conflated_handlers: Dict[Tuple[str, HandlerType], ConflatedHandler] = {}
+
+        self._profiler: Optional[EventProfiler] = None
+        self._profile_interval: int = 0
+        self._profile_count: int = 0
+
+        # Default timer is the one with empty name
+        self._scheduler: TimerScheduler = TimerScheduler()
+        self._scheduler.add("", interval)
+        self._timer_condition: Condition = Condition()
 
     def _run(self) -> None:
         """
@@ -69,20 +305,77 @@ class EventEngine:
         Then distribute event to those general handlers which listens
         to all types.
         """
+        # Profiler may be stopped from other thread at any time
+        profiler: Optional[EventProfiler] = self._profiler
+        if profiler:
+            handlers: list = self._handlers.get(event.type, []) + self._general_handlers
+            profiler.process(event, handlers)
+            return
+
         if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+            for handler in self._handlers[event.type]:
+                handler(event)
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        for handler in self._general_handlers:
+            handler(event)
 
     def _run_timer(self) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until the nearest timer deadline and then generate timer events.
         """
+        # Default timer starts from now
+        with self._timer_condition:
+            self._scheduler.add("", self._interval)
+
         while self._active:
-            sleep(self._interval)
-            event: Event = Event(EVENT_TIMER)
-            self.put(event)
+            with self._timer_condition:
+                names: List[str] = self._scheduler.pop_due(monotonic())
+
+                if not names:
+                    next_time: Optional[float] = self._scheduler.get_next_time()
+                    if next_time is None:
+                        timeout: float = 1
+                    else:
+                        timeout = next_time - monotonic()
+
+                    self._timer_condition.wait(timeout)
+                    continue
+
+            self._fire_timers(names)
+
+    def _fire_timers(self, names: List[str]) -> None:
+        """
+        Generate timer events of named timers.
+        """
+        for name in names:
+            if name:
+                self.put(Event(get_timer_type(name), name))
+            else:
+                self._put_timer()
+
+    def _notify_timer(self) -> None:
+        """
+        Wake up timer thread when schedule changed.
+        """
+        with self._timer_condition:
+            self._timer_condition.notify()
+
+    def _put_timer(self) -> None:
+        """
+        Generate a timer event.
+        """
+        event: Event = Event(EVENT_TIMER)
+        self.put(event)
+
+        # Sample queue depth and publish profile report periodically
+        profiler: Optional[EventProfiler] = self._profiler
+        if profiler:
+            profiler.record_depth(self.get_queue_size())
+
+            self._profile_count += 1
+            if self._profile_count >= self._profile_interval:
+                self._profile_count = 0
+                self.put(Event(EVENT_PROFILE, profiler.get_report()))
 
     def start(self) -> None:
         """
@@ -97,15 +390,79 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
+        self._notify_timer()
         self._timer.join()
         self._thread.join()
 
+        for conflated_handler in self._conflated_handlers.values():
+            conflated_handler.stop()
+
     def put(self, event: Event) -> None:
         """
         Put an event object into event queue.
         """
+        if self._profiler:
+            event.put_time = perf_counter()
+
         self._queue.put(event)
 
+    def get_queue_size(self) -> int:
+        """
+        Number of events waiting in queue.
+        """
+        return self._queue.qsize()
+
+    def add_timer(self, name: str, interval: float, repeat: bool = True) -> None:
+        """
+        Add named timer generating event of get_timer_type(name) after
+        interval seconds, and then every interval seconds if repeat.
+
+        ValueError is raised if interval of repeating timer is not positive.
+        """
+        with self._timer_condition:
+            self._scheduler.add(name, interval, repeat)
+        self._notify_timer()
+
+    def add_deadline(self, name: str, dt: datetime) -> None:
+        """
+        Add one-shot named timer generating event at datetime.
+        """
+        delay: float = max(dt.timestamp() - time(), 0)
+        self.add_timer(name, delay, False)
+
+    def remove_timer(self, name: str) -> None:
+        """
+        Remove named timer.
+        """
+        with self._timer_condition:
+            self._scheduler.remove(name)
+        self._notify_timer()
+
+    def start_profiling(self, interval: int = 10) -> None:
+        """
+        Start recording queue latency, handler execution time and queue
+        depth. Report is published as profile event every interval timer
+        events.
+        """
+        self._profile_interval = interval
+        if not self._profiler:
+            self._profiler = EventProfiler()
+
+    def stop_profiling(self) -> None:
+        """
+        Stop profiling and discard records.
+        """
+        self._profiler = None
+
+    def get_profile(self) -> dict:
+        """
+        Get report of profiling records, or empty dict if not enabled.
+        """
+        profiler: Optional[EventProfiler] = self._profiler
+        if not profiler:
+            return {}
+        return profiler.get_report()
+
     def register(self, type: str, handler: HandlerType) -> None:
         """
         Register a new handler function for a specific event type. Every
@@ -115,10 +472,40 @@ class EventEngine:
         if handler not in handler_list:
             handler_list.append(handler)
 
+    def register_conflated(
+        self,
+        type: str,
+        handler: HandlerType,
+        key_func: KeyFuncType = get_event_key
+    ) -> ConflatedHandler:
+        """
+        Register a handler function which only processes the latest event
+        of each key (vt_symbol by default), when it can not keep up with
+        the event flow.
+
+        The handler is called in its own thread, and the returned object
+        provides queue depth and dropped count.
+        """
+        conflated_handler: ConflatedHandler = self._conflated_handlers.get((type, handler), None)
+        if conflated_handler:
+            return conflated_handler
+
+        conflated_handler = ConflatedHandler(handler, key_func)
+        conflated_handler.start()
+
+        self._conflated_handlers[(type, handler)] = conflated_handler
+        self.register(type, conflated_handler)
+        return conflated_handler
+
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
         Unregister an existing handler function from event engine.
         """
+        conflated_handler: ConflatedHandler = self._conflated_handlers.pop((type, handler), None)
+        if conflated_handler:
+            conflated_handler.stop()
+            handler = conflated_handler
+
         handler_list: list = self._handlers[type]
 
         if handler in handler_list:
@@ -141,3 +528,393 @@ class EventEngine:
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+
+
+class PriorityEventEngine(EventEngine):
+    """
+    Event engine which keeps one queue for each priority level, and
+    drains events in batches from the highest priority queue not empty.
+
+    Priority of event type is decided by the longest matched prefix in
+    priorities dict, so "eOrder." also applies to "eOrder.xxx". Event
+    types not matched are of normal priority, and timer event is of low
+    priority by default.
+
+    Higher priority events wait for at most one batch of lower priority
+    events, so order and trade events are no longer delayed behind tick
+    bursts.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        priorities: Dict[str, int] = None,
+        batch_size: int = 100
+    ) -> None:
+        """"""
+        super().__init__(interval)
+
+        self._batch_size: int = batch_size
+        self._priorities: Dict[str, int] = {EVENT_TIMER: PRIORITY_LOW}
+        if priorities:
+            self._priorities.update(priorities)
+
+        self._type_priorities: Dict[str, int] = {}
+        levels: int = max(PRIORITY_LOW, *self._priorities.values()) + 1
+        self._queues: List[Deque[Event]] = [deque() for _ in range(levels)]
+        self._condition: Condition = Condition()
+
+    def _run(self) -> None:
+        """
+        Get a batch of events from queues and then process them.
+        """
+        while self._active:
+            events: List[Event] = self._get_batch()
+
+            for event in events:
+                self._process(event)
+
+    def _get_batch(self) -> List[Event]:
+        """
+        Pop events from the highest priority queue not empty, or return
+        empty list if no event arrived in 1 second.
+        """
+        with self._condition:
+            for queue in self._queues:
+                if queue:
+                    break
+            else:
+                self._condition.wait(1)
+                return []
+
+            size: int = min(len(queue), self._batch_size)
+            return [queue.popleft() for _ in range(size)]
+
+    def get_priority(self, type: str) -> int:
+        """
+        Get priority of event type, the result is cached for each type.
+        """
+        priority: int = self._type_priorities.get(type, None)
+        if priority is not None:
+            return priority
+
+        prefix: str = ""
+        priority = PRIORITY_NORMAL
+
+        for k, v in self._priorities.items():
+            if type.startswith(k) and len(k) > len(prefix):
+                prefix = k
+                priority = v
+
+        self._type_priorities[type] = priority
+        return priority
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into queue of its priority.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        priority: int = self._type_priorities.get(event.type, None)
+        if priority is None:
+            priority = self.get_priority(event.type)
+
+        with self._condition:
+            self._queues[priority].append(event)
+            self._condition.notify()
+
+    def get_queue_size(self) -> int:
+        """
+        Number of events waiting in all queues.
+        """
+        return sum(len(queue) for queue in self._queues)
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which distributes events onto multiple worker threads
+    by shard key, which is vt_symbol of event data by default.
+
+    Events of the same key are always processed by the same thread in
+    order, so tick, order and trade events of one contract are never
+    reordered, and a slow handler only delays contracts on its shard.
+    Events without key (timer, log, account, etc.) go to the first shard.
+
+    Handlers registered on types shared by multiple contracts may be
+    called from different threads concurrently, so they should not rely
+    on being called serially. A custom key_func can be used to put
+    multiple contracts of one strategy onto the same shard.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        shard_count: int = 4,
+        key_func: KeyFuncType = get_shard_key
+    ) -> None:
+        """"""
+        super().__init__(interval)
+
+        self._shard_count: int = shard_count
+        self._key_func: KeyFuncType = key_func
+        self._queues: List[Queue] = [Queue() for _ in range(shard_count)]
+        self._threads: List[Thread] = [
+            Thread(target=self._run_shard, args=(queue,)) for queue in self._queues
+        ]
+
+    def _run_shard(self, queue: Queue) -> None:
+        """
+        Get event from queue of shard and then process it.
+        """
+        while self._active:
+            try:
+                event: Event = queue.get(block=True, timeout=1)
+                self._process(event)
+            except Empty:
+                pass
+
+    def start(self) -> None:
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+        for thread in self._threads:
+            thread.start()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._notify_timer()
+        self._timer.join()
+        for thread in self._threads:
+            thread.join()
+
+        for conflated_handler in self._conflated_handlers.values():
+            conflated_handler.stop()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into queue of its shard.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        key: Hashable = self._key_func(event)
+
+        if key is None:
+            index: int = 0
+        else:
+            index = hash(key) % self._shard_count
+
+        self._queues[index].put(event)
+
+    def get_queue_size(self) -> int:
+        """
+        Number of events waiting in all queues.
+        """
+        return sum(queue.qsize() for queue in self._queues)
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    Event engine running on asyncio event loop.
+
+    Handlers can be normal functions or coroutine functions, which are
+    awaited in order before next event is processed. Timer events are
+    scheduled with loop.call_at at the nearest timer deadline.
+
+    The put function is thread-safe, so existing thread-based gateways
+    can put events into engine directly. If no loop is provided, a new
+    loop is created and run in its own thread when started, otherwise
+    the provided loop should be run by caller.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """"""
+        super().__init__(interval)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = loop
+        self._own_loop: bool = loop is None
+        self._loop_thread_id: int = 0
+
+        # Queue is created in event loop when started, since it is bound
+        # to the current loop when created on Python 3.8/3.9. Events put
+        # before that are kept in pending deque.
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending_events: Deque[Event] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._timer_handle: Optional[asyncio.TimerHandle] = None
+
+    def _run_loop(self) -> None:
+        """
+        Run event loop owned by engine.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _start_tasks(self) -> None:
+        """
+        Start processing task and timer in event loop.
+        """
+        self._queue = asyncio.Queue()
+        while self._pending_events:
+            self._queue.put_nowait(self._pending_events.popleft())
+
+        self._loop_thread_id = get_ident()
+        self._task = self._loop.create_task(self._run_async())
+
+        with self._timer_condition:
+            self._scheduler.add("", self._interval)
+        self._schedule_timer()
+
+    def _stop_tasks(self) -> None:
+        """
+        Cancel processing task and timer in event loop.
+        """
+        if self._timer_handle:
+            self._timer_handle.cancel()
+
+        if self._task:
+            self._task.cancel()
+
+        # Stop loop owned by engine after task finished cancelling
+        if self._own_loop:
+            if self._task:
+                self._task.add_done_callback(lambda task: self._loop.stop())
+            else:
+                self._loop.stop()
+
+    async def _run_async(self) -> None:
+        """
+        Get event from queue and then process it.
+        """
+        while self._active:
+            event: Event = await self._queue.get()
+            await self._process_async(event)
+
+    async def _process_async(self, event: Event) -> None:
+        """
+        Distribute event to handlers, and await those returning awaitable.
+        """
+        handlers: list = self._handlers.get(event.type, []) + self._general_handlers
+
+        profiler: Optional[EventProfiler] = self._profiler
+        if not profiler:
+            for handler in handlers:
+                result: Any = handler(event)
+                if isawaitable(result):
+                    await result
+            return
+
+        start: float = perf_counter()
+        costs: list = []
+
+        for handler in handlers:
+            handler_start: float = perf_counter()
+            result = handler(event)
+            if isawaitable(result):
+                await result
+            costs.append((handler, perf_counter() - handler_start))
+
+        profiler.record(event, start, costs)
+
+    def _schedule_timer(self) -> None:
+        """
+        Schedule callback at the nearest timer deadline.
+        """
+        if self._timer_handle:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+
+        if not self._active:
+            return
+
+        with self._timer_condition:
+            next_time: Optional[float] = self._scheduler.get_next_time()
+
+        # Loop time of asyncio is based on monotonic clock
+        if next_time is not None:
+            self._timer_handle = self._loop.call_at(next_time, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """
+        Generate timer events and schedule the next callback.
+        """
+        self._timer_handle = None
+
+        with self._timer_condition:
+            names: List[str] = self._scheduler.pop_due(monotonic())
+
+        self._fire_timers(names)
+        self._schedule_timer()
+
+    def _notify_timer(self) -> None:
+        """
+        Reschedule timer callback in event loop when schedule changed.
+        """
+        if self._active and self._loop_thread_id:
+            self._loop.call_soon_threadsafe(self._schedule_timer)
+
+    def start(self) -> None:
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+
+        if self._own_loop:
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run_loop)
+            self._thread.start()
+
+        self._loop.call_soon_threadsafe(self._start_tasks)
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._loop.call_soon_threadsafe(self._stop_tasks)
+
+        if self._own_loop:
+            self._thread.join()
+            self._loop.close()
+
+        for conflated_handler in self._conflated_handlers.values():
+            conflated_handler.stop()
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into event queue, can be called from any thread.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        if self._loop_thread_id == get_ident():
+            self._queue.put_nowait(event)
+        elif not self._active:
+            self._pending_events.append(event)
+        else:
+            self._loop.call_soon_threadsafe(self._put_nowait, event)
+
+    def _put_nowait(self, event: Event) -> None:
+        """
+        Put event into queue in event loop, which is created by then.
+        """
+        self._queue.put_nowait(event)
+
+    def get_queue_size(self) -> int:
+        """
+        Number of events waiting in queue.
+        """
+        size: int = len(self._pending_events)
+        if self._queue:
+            size += self._queue.qsize()
+        return size
@@ -0,0 +1,156 @@
+"""
+Latency instrumentation of event engine.
+"""
+
+from collections import defaultdict, deque
+from threading import Lock
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from .engine import Event
+
+
+# Number of buckets in histogram, bucket i holds values in [2^(i-1), 2^i) us.
+BUCKET_COUNT: int = 32
+
+
+def get_handler_name(handler: Callable) -> str:
+    """
+    Get readable name of handler function.
+    """
+    name: str = getattr(handler, "__qualname__", "")
+    if not name:
+        name = type(handler).__qualname__
+    return name
+
+
+class LatencyHistogram:
+    """
+    Histogram of time costs with log2 scaled buckets in microseconds.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.buckets: List[int] = [0] * BUCKET_COUNT
+
+    def add(self, value: float) -> None:
+        """
+        Add time cost in seconds.
+        """
+        us: float = value * 1_000_000
+
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+
+        index: int = min(int(us).bit_length(), BUCKET_COUNT - 1)
+        self.buckets[index] += 1
+
+    def get_percentile(self, percent: float) -> float:
+        """
+        Get upper bound of bucket (us) in which the percentile falls.
+        """
+        if not self.count:
+            return 0
+
+        target: float = self.count * percent / 100
+        accumulated: int = 0
+
+        for i, n in enumerate(self.buckets):
+            accumulated += n
+            if accumulated >= target:
+                return min(2 ** i, self.max)
+
+        return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Summary of histogram, time values are in microseconds.
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.max,
+            "p50": self.get_percentile(50),
+            "p99": self.get_percentile(99),
+            "buckets": list(self.buckets)
+        }
+
+
+class EventProfiler:
+    """
+    Records queue latency of each event type, execution time of each
+    handler, and queue depth sampled over time.
+    """
+
+    def __init__(self, depth_size: int = 3600) -> None:
+        """"""
+        self.queue_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.handler_time: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.queue_depth: Deque[Tuple[float, int]] = deque(maxlen=depth_size)
+
+        self.lock: Lock = Lock()
+
+    def process(self, event: "Event", handlers: List[Callable]) -> None:
+        """
+        Distribute event to handlers and record time costs.
+        """
+        start: float = perf_counter()
+
+        costs: List[Tuple[Callable, float]] = []
+        for handler in handlers:
+            handler_start: float = perf_counter()
+            handler(event)
+            costs.append((handler, perf_counter() - handler_start))
+
+        self.record(event, start, costs)
+
+    def record(
+        self,
+        event: "Event",
+        start: float,
+        costs: List[Tuple[Callable, float]]
+    ) -> None:
+        """
+        Record queue latency of event dispatched at start time, and time
+        costs of handlers.
+        """
+        put_time: float = getattr(event, "put_time", 0)
+
+        with self.lock:
+            if put_time:
+                self.queue_latency[event.type].add(start - put_time)
+
+            for handler, cost in costs:
+                self.handler_time[get_handler_name(handler)].add(cost)
+
+    def record_depth(self, depth: int) -> None:
+        """
+        Record queue depth at current time.
+        """
+        self.queue_depth.append((time(), depth))
+
+    def get_report(self) -> dict:
+        """
+        Get snapshot of all records.
+        """
+        with self.lock:
+            return {
+                "queue_latency": {k: v.to_dict() for k, v in self.queue_latency.items()},
+                "handler_time": {k: v.to_dict() for k, v in self.handler_time.items()},
+                "queue_depth": list(self.queue_depth)
+            }
+
+    def reset(self) -> None:
+        """
+        Clear all records.
+        """
+        with self.lock:
+            self.queue_latency.clear()
+            self.handler_time.clear()
+            self.queue_depth.clear()
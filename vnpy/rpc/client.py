@@ -1,11 +1,16 @@
+import heapq
 import threading
+import weakref
+from concurrent.futures import Future
+from itertools import count
 from time import time
 from functools import lru_cache
-from typing import Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import zmq
 
-from .common import HEARTBEAT_TOPIC, HEARTBEAT_TOLERANCE
+from .common import HEARTBEAT_TOPIC, HEARTBEAT_TOLERANCE, NEGOTIATE_FUNCTION, BATCH_FUNCTION, TopicStatistics
+from .serializer import BaseSerializer, get_serializers
 
 
 class RemoteException(Exception):
@@ -29,28 +34,65 @@ class RemoteException(Exception):
 class RpcClient:
     """"""
 
-    def __init__(self) -> None:
-        """Constructor"""
+    def __init__(self, serializers: List[str] = None) -> None:
+        """
+        Constructor
+
+        Serializers are tried in order when negotiating with server, all
+        available ones (msgpack first if installed) are used by default.
+        """
         # zmq port related
         self._context: zmq.Context = zmq.Context()
 
-        # Request socket (Request–reply pattern)
-        self._socket_req: zmq.Socket = self._context.socket(zmq.REQ)
+        # Dealer sockets (Request–reply pattern), one for each thread
+        # calling remote functions, so that calls from different threads
+        # can be in flight concurrently, closed when the thread exits
+        self._local: threading.local = threading.local()
+        self._req_sockets: Set[zmq.Socket] = set()
+        self._req_address: str = ""
 
         # Subscribe socket (Publish–subscribe pattern)
         self._socket_sub: zmq.Socket = self._context.socket(zmq.SUB)
+        self.set_keepalive(self._socket_sub)
+
+        # Dealer socket used by async thread, and push/pull socket pair
+        # for passing async requests from caller threads to it
+        self._socket_async: zmq.Socket = self._context.socket(zmq.DEALER)
+        self.set_keepalive(self._socket_async)
+
+        async_address: str = f"inproc://rpc_async_{id(self)}"
 
-        # Set socket option to keepalive
-        for socket in [self._socket_req, self._socket_sub]:
-            socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
-            socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 60)
+        self._socket_pull: zmq.Socket = self._context.socket(zmq.PULL)
+        self._socket_pull.bind(async_address)
+
+        self._socket_push: zmq.Socket = self._context.socket(zmq.PUSH)
+        self._socket_push.connect(async_address)
+        self._push_lock: threading.Lock = threading.Lock()
 
         # Worker thread relate, used to process data pushed from server
         self._active: bool = False                 # RpcClient status
         self._thread: threading.Thread = None      # RpcClient thread
+        self._async_thread: threading.Thread = None
         self._lock: threading.Lock = threading.Lock()
 
+        # Futures of async requests waiting for reply: key is request id
+        self._futures: Dict[bytes, Future] = {}
+        self._deadlines: List[Tuple[float, bytes]] = []
+
         self._last_received_ping: time = time()
+        self._sub_statistics: TopicStatistics = TopicStatistics()
+
+        # Request id used for discarding replies of timeout requests
+        self._count: count = count()
+
+        # Serializer related, negotiated before the first request
+        self._serializers: Dict[str, BaseSerializer] = get_serializers()
+        if serializers:
+            self._candidates: List[str] = serializers
+        else:
+            self._candidates = list(self._serializers.keys())
+        self._serializer: Optional[BaseSerializer] = None
+        self._negotiate_lock: threading.Lock = threading.Lock()
 
     @lru_cache(100)
     def __getattr__(self, name: str) -> Any:
@@ -70,16 +112,8 @@ class RpcClient:
             req: list = [name, args, kwargs]
 
             # Send request and wait for response
-            with self._lock:
-                self._socket_req.send_pyobj(req)
-
-                # Timeout reached without any data
-                n: int = self._socket_req.poll(timeout)
-                if not n:
-                    msg: str = f"Timeout of {timeout}ms reached for {req}"
-                    raise RemoteException(msg)
-
-                rep = self._socket_req.recv_pyobj()
+            serializer: BaseSerializer = self.get_serializer(timeout)
+            rep = self._send_request(req, serializer, timeout)
 
             # Return response if successed; Trigger exception if failed
             if rep[0]:
@@ -89,6 +123,160 @@ class RpcClient:
 
         return dorpc
 
+    def get_serializer(self, timeout: int) -> BaseSerializer:
+        """
+        Get serializer of requests, negotiate with server if not yet.
+        """
+        if not self._serializer:
+            with self._negotiate_lock:
+                if not self._serializer:
+                    self._serializer = self.negotiate_serializer(timeout)
+
+        return self._serializer
+
+    def call_async(self, name: str, *args, timeout: int = 30000, **kwargs) -> Future:
+        """
+        Call remote function without waiting for reply.
+
+        Returned future is resolved with result of the function, or with
+        RemoteException if failed or timeout. Requests sent by call_async
+        are pipelined over one connection, use asyncio.wrap_future for
+        awaiting the future in asyncio code.
+        """
+        future: Future = Future()
+
+        if not self._active:
+            future.set_exception(RemoteException(f"RpcClient is not started for {name}"))
+            return future
+
+        serializer: BaseSerializer = self.get_serializer(timeout)
+        req_id: bytes = str(next(self._count)).encode()
+        deadline: float = time() + timeout / 1000
+
+        with self._lock:
+            self._futures[req_id] = future
+
+        data: bytes = serializer.dumps([name, args, kwargs])
+        with self._push_lock:
+            self._socket_push.send_multipart([
+                b"", serializer.name.encode(), req_id, data, str(deadline).encode()
+            ])
+
+        return future
+
+    def call_batch_async(self, requests: List[tuple], timeout: int = 30000) -> Future:
+        """
+        Send requests of (name, args, kwargs) in one message, and return
+        future of list with [True, result] or [False, traceback] of each.
+        """
+        reqs: list = [[name, args, kwargs] for name, args, kwargs in requests]
+        return self.call_async(BATCH_FUNCTION, reqs, timeout=timeout)
+
+    def call_batch(
+        self,
+        requests: List[tuple],
+        timeout: int = 30000,
+        return_exceptions: bool = False
+    ) -> list:
+        """
+        Send requests of (name, args, kwargs) in one message, which are
+        executed one by one on server, and return results of all.
+
+        Failed request raises RemoteException, or is returned as exception
+        in results if return_exceptions is True.
+        """
+        reqs: list = [[name, args, kwargs] for name, args, kwargs in requests]
+        rep: list = getattr(self, BATCH_FUNCTION)(reqs, timeout=timeout)
+
+        results: list = []
+        for ok, r in rep:
+            if ok:
+                results.append(r)
+            elif return_exceptions:
+                results.append(RemoteException(r))
+            else:
+                raise RemoteException(r)
+
+        return results
+
+    def set_keepalive(self, socket: zmq.Socket) -> None:
+        """
+        Set socket option to keepalive
+        """
+        socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
+        socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 60)
+
+    def get_req_socket(self) -> zmq.Socket:
+        """
+        Get dealer socket of current thread, create it if not exists.
+        """
+        socket: Optional[zmq.Socket] = getattr(self._local, "socket", None)
+        if socket:
+            return socket
+
+        socket = self._context.socket(zmq.DEALER)
+        self.set_keepalive(socket)
+
+        with self._lock:
+            if self._req_address:
+                socket.connect(self._req_address)
+            self._req_sockets.add(socket)
+
+        # Finalizer only references socket related objects, so that client
+        # is not kept alive by threads calling it
+        finalizer: weakref.finalize = weakref.finalize(
+            threading.current_thread(),
+            release_req_socket,
+            socket,
+            self._req_sockets,
+            self._lock
+        )
+        finalizer.atexit = False
+
+        self._local.socket = socket
+        return socket
+
+    def _send_request(self, req: list, serializer: BaseSerializer, timeout: int) -> Any:
+        """
+        Send request with serializer and wait for response.
+        """
+        socket: zmq.Socket = self.get_req_socket()
+        req_id: bytes = str(next(self._count)).encode()
+
+        socket.send_multipart([b"", serializer.name.encode(), req_id, serializer.dumps(req)])
+
+        end: float = time() + timeout / 1000
+        while True:
+            # Timeout reached without any data
+            remaining: int = int((end - time()) * 1000)
+            if remaining <= 0 or not socket.poll(remaining):
+                msg: str = f"Timeout of {timeout}ms reached for {req}"
+                raise RemoteException(msg)
+
+            # Replies of previous timeout requests are discarded
+            _, name, rep_id, data = socket.recv_multipart()
+            if rep_id == req_id:
+                return self._serializers[name.decode()].loads(data)
+
+    def negotiate_serializer(self, timeout: int) -> BaseSerializer:
+        """
+        Negotiate serializer of request and reply with server, fall back
+        to pickle if server does not support negotiation.
+        """
+        pickle_serializer: BaseSerializer = self._serializers["pickle"]
+
+        candidates: list = [
+            (name, self._serializers[name].get_schema())
+            for name in self._candidates if name in self._serializers
+        ]
+        req: list = [NEGOTIATE_FUNCTION, (candidates,), {}]
+
+        rep: list = self._send_request(req, pickle_serializer, timeout)
+        if not rep[0]:
+            return pickle_serializer
+
+        return self._serializers[rep[1]]
+
     def start(
         self,
         req_address: str,
@@ -101,8 +289,15 @@ class RpcClient:
             return
 
         # Connect zmq port
-        self._socket_req.connect(req_address)
+        with self._lock:
+            self._req_address = req_address
+            for socket in self._req_sockets:
+                socket.connect(req_address)
+
+        self._socket_async.connect(req_address)
+
         self._socket_sub.connect(sub_address)
+        self.subscribe_topic(HEARTBEAT_TOPIC)
 
         # Start RpcClient status
         self._active = True
@@ -111,6 +306,9 @@ class RpcClient:
         self._thread = threading.Thread(target=self.run)
         self._thread.start()
 
+        self._async_thread = threading.Thread(target=self.run_async)
+        self._async_thread.start()
+
         self._last_received_ping = time()
 
     def stop(self) -> None:
@@ -129,6 +327,10 @@ class RpcClient:
             self._thread.join()
         self._thread = None
 
+        if self._async_thread and self._async_thread.is_alive():
+            self._async_thread.join()
+        self._async_thread = None
+
     def run(self) -> None:
         """
         Run RpcClient function
@@ -140,28 +342,127 @@ class RpcClient:
                 self.on_disconnected()
                 continue
 
-            # Receive data from subscribe socket
-            topic, data = self._socket_sub.recv_pyobj(flags=zmq.NOBLOCK)
+            # Receive data from subscribe socket in frames of topic,
+            # serializer name and list of data
+            topic_frame, name, buf = self._socket_sub.recv_multipart(flags=zmq.NOBLOCK)
+
+            topic: str = topic_frame.decode()
+            batch: list = self._serializers[name.decode()].loads(buf)
+            self._sub_statistics.update(topic, len(batch), len(buf))
 
             if topic == HEARTBEAT_TOPIC:
-                self._last_received_ping = data
+                self._last_received_ping = batch[-1]
             else:
                 # Process data by callable function
-                self.callback(topic, data)
+                for data in batch:
+                    self.callback(topic, data)
 
         # Close socket
-        self._socket_req.close()
+        with self._lock:
+            for socket in self._req_sockets:
+                socket.close()
         self._socket_sub.close()
 
+    def run_async(self) -> None:
+        """
+        Send async requests and resolve futures with replies.
+        """
+        poller: zmq.Poller = zmq.Poller()
+        poller.register(self._socket_pull, zmq.POLLIN)
+        poller.register(self._socket_async, zmq.POLLIN)
+
+        while self._active:
+            # Poll until the nearest deadline, at most 1 second
+            if self._deadlines:
+                timeout: int = int((self._deadlines[0][0] - time()) * 1000) + 1
+                timeout = min(max(timeout, 0), 1000)
+            else:
+                timeout = 1000
+
+            events: dict = dict(poller.poll(timeout))
+
+            # Forward requests from caller threads
+            if self._socket_pull in events:
+                while self._socket_pull.poll(0):
+                    frames: List[bytes] = self._socket_pull.recv_multipart()
+                    heapq.heappush(self._deadlines, (float(frames[-1]), frames[2]))
+                    self._socket_async.send_multipart(frames[:-1])
+
+            # Resolve futures with replies
+            if self._socket_async in events:
+                while self._socket_async.poll(0):
+                    _, name, rep_id, data = self._socket_async.recv_multipart()
+
+                    with self._lock:
+                        future: Optional[Future] = self._futures.pop(rep_id, None)
+
+                    # Future removed because of timeout
+                    if not future:
+                        continue
+
+                    try:
+                        rep: list = self._serializers[name.decode()].loads(data)
+                    except Exception as e:
+                        self.set_future(future, exception=e)
+                        continue
+
+                    if rep[0]:
+                        self.set_future(future, result=rep[1])
+                    else:
+                        self.set_future(future, exception=RemoteException(rep[1]))
+
+            # Remove futures of timeout requests
+            now: float = time()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, req_id = heapq.heappop(self._deadlines)
+
+                with self._lock:
+                    future = self._futures.pop(req_id, None)
+
+                if future:
+                    msg: str = f"Timeout reached for request {req_id.decode()}"
+                    self.set_future(future, exception=RemoteException(msg))
+
+        # Cancel futures not finished
+        with self._lock:
+            futures: List[Future] = list(self._futures.values())
+            self._futures.clear()
+        self._deadlines.clear()
+
+        for future in futures:
+            self.set_future(future, exception=RemoteException("RpcClient is stopped"))
+
+        self._socket_async.close()
+        self._socket_pull.close()
+
+    def set_future(self, future: Future, result: Any = None, exception: Exception = None) -> None:
+        """
+        Set result or exception of future, unless it is cancelled.
+        """
+        if not future.set_running_or_notify_cancel():
+            return
+
+        if exception:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
     def callback(self, topic: str, data: Any) -> None:
         """
         Callable function
         """
         raise NotImplementedError
 
+    def get_subscribe_statistics(self) -> Dict[str, dict]:
+        """
+        Get message count, batch count, bytes and rate of each topic received.
+        """
+        return self._sub_statistics.get_statistics()
+
     def subscribe_topic(self, topic: str) -> None:
         """
-        Subscribe data
+        Subscribe data of topics starting with topic string, which is
+        filtered by zmq without deserializing data.
         """
         self._socket_sub.setsockopt_string(zmq.SUBSCRIBE, topic)
 
@@ -171,3 +472,12 @@ class RpcClient:
         """
         msg: str = f"RpcServer has no response over {HEARTBEAT_TOLERANCE} seconds, please check you connection."
         print(msg)
+
+
+def release_req_socket(socket: zmq.Socket, sockets: Set[zmq.Socket], lock: threading.Lock) -> None:
+    """
+    Close dealer socket of exited thread.
+    """
+    with lock:
+        sockets.discard(socket)
+        socket.close(linger=0)
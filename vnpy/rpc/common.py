@@ -1,4 +1,6 @@
 import signal
+from time import time
+from typing import Dict, List
 
 
 # Achieve Ctrl-c interrupt recv
@@ -8,3 +10,49 @@ signal.signal(signal.SIGINT, signal.SIG_DFL)
 HEARTBEAT_TOPIC = "heartbeat"
 HEARTBEAT_INTERVAL = 10
 HEARTBEAT_TOLERANCE = 30
+
+# Name of built-in function used for negotiating serializer
+NEGOTIATE_FUNCTION = "_negotiate_serializer"
+
+# Name of built-in function used for executing a batch of requests
+BATCH_FUNCTION = "_call_batch"
+
+
+class TopicStatistics:
+    """
+    Message count, batch count and bytes of each topic.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.start: float = time()
+        self.data: Dict[str, List[int]] = {}
+
+    def update(self, topic: str, count: int, size: int) -> None:
+        """
+        Update with a batch of messages.
+        """
+        data: List[int] = self.data.get(topic, None)
+        if not data:
+            data = [0, 0, 0]
+            self.data[topic] = data
+
+        data[0] += count
+        data[1] += 1
+        data[2] += size
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        Get statistics of each topic, rate is message count per second.
+        """
+        elapsed: float = max(time() - self.start, 1e-6)
+
+        return {
+            topic: {
+                "count": count,
+                "batch_count": batch_count,
+                "bytes": size,
+                "rate": count / elapsed
+            }
+            for topic, (count, batch_count, size) in self.data.items()
+        }
@@ -0,0 +1,265 @@
+"""
+Serializers used by RPC for encoding requests, replies and published data.
+"""
+
+import pickle
+import struct
+from dataclasses import MISSING, fields
+from datetime import datetime, timedelta, timezone, tzinfo
+from enum import Enum
+from hashlib import md5
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from vnpy.trader import constant as trader_constant, object as trader_object
+from vnpy.trader.utility import ZoneInfo
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Ext type codes used by msgpack serializer
+EXT_RECORD: int = 1
+EXT_ENUM: int = 2
+EXT_DATETIME: int = 3
+EXT_PICKLE: int = 4
+EXT_TUPLE: int = 5
+
+# Changed when packed format of msgpack serializer is changed
+MSGPACK_VERSION: int = 2
+
+EPOCH: datetime = datetime(1970, 1, 1)
+EPOCH_ORDINAL: int = EPOCH.toordinal()
+
+
+class BaseSerializer:
+    """
+    Convert between python object and bytes.
+    """
+
+    name: str = ""
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize object into bytes.
+        """
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Deserialize bytes into object.
+        """
+        raise NotImplementedError
+
+    def get_schema(self) -> str:
+        """
+        Digest of schema which should be the same on both sides.
+        """
+        return ""
+
+
+class PickleSerializer(BaseSerializer):
+    """
+    Serializer based on pickle, supports any picklable object.
+    """
+
+    name: str = "pickle"
+
+    def dumps(self, obj: Any) -> bytes:
+        """"""
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        """"""
+        return pickle.loads(data)
+
+
+class MsgpackSerializer(BaseSerializer):
+    """
+    Compact binary serializer based on msgpack.
+
+    Data classes of vnpy.trader.object are packed as tuples of field
+    values in declaration order with a class index, and enums as class
+    index with value, so field names are never sent. Tuples are packed
+    as ext type, so they are restored as tuples and can be used as dict
+    keys. Other objects not supported by msgpack are packed with pickle.
+    """
+
+    name: str = "msgpack"
+
+    def __init__(self) -> None:
+        """"""
+        self.record_classes: List[Type] = [
+            v for v in vars(trader_object).values()
+            if isinstance(v, type) and v.__module__ == trader_object.__name__ and hasattr(v, "__dataclass_fields__")
+        ]
+        self.enum_classes: List[Type[Enum]] = [
+            v for v in vars(trader_constant).values()
+            if isinstance(v, type) and issubclass(v, Enum) and v.__module__ == trader_constant.__name__
+        ]
+
+        self.record_indexes: Dict[Type, int] = {c: i for i, c in enumerate(self.record_classes)}
+
+        # Ext data of every enum member is prepared in advance
+        self.enum_exts: Dict[Enum, msgpack.ExtType] = {}
+        self.enum_members: Dict[bytes, Enum] = {}
+
+        for i, c in enumerate(self.enum_classes):
+            for member in c:
+                data: bytes = msgpack.packb([i, member.value])
+                self.enum_exts[member] = msgpack.ExtType(EXT_ENUM, data)
+                self.enum_members[data] = member
+
+        self.record_fields: List[Tuple[str, ...]] = [
+            tuple(f.name for f in fields(c)) for c in self.record_classes
+        ]
+        self.record_names: List[frozenset] = [frozenset(names) for names in self.record_fields]
+        self.record_getters: List[Callable] = [attrgetter(*names) for names in self.record_fields]
+
+        # Number of fields always in instance dict, excluding those not
+        # set in __init__ but with class level default (like extra)
+        self.record_counts: List[int] = [
+            len([f for f in fields(c) if f.init or f.default is MISSING]) for c in self.record_classes
+        ]
+
+        self.timezones: Dict[bytes, tzinfo] = {}
+        self.timezone_datas: Dict[tzinfo, bytes] = {None: b""}
+
+    def dumps(self, obj: Any) -> bytes:
+        """"""
+        # Strict types make tuples and subclasses of builtin types go to
+        # encode, instead of being packed as list or base type silently
+        return msgpack.packb(obj, default=self.encode, use_bin_type=True, strict_types=True)
+
+    def loads(self, data: bytes) -> Any:
+        """"""
+        return msgpack.unpackb(data, ext_hook=self.decode, raw=False, strict_map_key=False)
+
+    def encode(self, obj: Any) -> Any:
+        """
+        Encode object not supported by msgpack.
+        """
+        index: Optional[int] = self.record_indexes.get(type(obj), None)
+        if index is not None:
+            values: tuple = self.record_getters[index](obj)
+
+            # Attributes not declared as fields, like LogData.time
+            d: dict = obj.__dict__
+            if len(d) != self.record_counts[index]:
+                extra_names: set = d.keys() - self.record_names[index]
+            else:
+                extra_names = None
+
+            if extra_names:
+                extra: dict = {k: getattr(obj, k) for k in extra_names}
+                data: bytes = self.dumps([index, list(values), extra])
+            else:
+                data = self.dumps([index, list(values)])
+
+            return msgpack.ExtType(EXT_RECORD, data)
+
+        # Datetime is packed as microseconds of wall clock time and timezone
+        if isinstance(obj, datetime):
+            seconds: int = (
+                (obj.toordinal() - EPOCH_ORDINAL) * 86400
+                + obj.hour * 3600 + obj.minute * 60 + obj.second
+            )
+            wall: bytes = struct.pack("<q", seconds * 1_000_000 + obj.microsecond)
+
+            tz: Optional[tzinfo] = obj.tzinfo
+            tz_data: Optional[bytes] = self.timezone_datas.get(tz, None)
+
+            if tz_data is None:
+                if isinstance(tz, ZoneInfo):
+                    tz_data = b"z" + tz.key.encode()
+                    self.timezone_datas[tz] = tz_data
+                else:
+                    tz_data = b"o" + struct.pack("<i", int(obj.utcoffset().total_seconds()))
+
+                    # Offset of fixed timezone does not change with datetime
+                    if isinstance(tz, timezone):
+                        self.timezone_datas[tz] = tz_data
+
+            return msgpack.ExtType(EXT_DATETIME, wall + tz_data)
+
+        ext: Optional[msgpack.ExtType] = self.enum_exts.get(obj, None) if isinstance(obj, Enum) else None
+        if ext:
+            return ext
+
+        if type(obj) is tuple:
+            return msgpack.ExtType(EXT_TUPLE, self.dumps(list(obj)))
+
+        return msgpack.ExtType(EXT_PICKLE, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+    def decode(self, code: int, data: bytes) -> Any:
+        """
+        Decode ext type data.
+        """
+        if code == EXT_RECORD:
+            buf: list = self.loads(data)
+            index: int = buf[0]
+
+            # Restore attributes directly without calling __init__ and __post_init__
+            obj: Any = self.record_classes[index].__new__(self.record_classes[index])
+            obj.__dict__.update(zip(self.record_fields[index], buf[1]))
+            if len(buf) > 2:
+                obj.__dict__.update(buf[2])
+            return obj
+
+        elif code == EXT_DATETIME:
+            dt: datetime = EPOCH + timedelta(microseconds=struct.unpack_from("<q", data)[0])
+
+            tz_data: bytes = data[8:]
+            if not tz_data:
+                return dt
+
+            tz: tzinfo = self.timezones.get(tz_data, None)
+            if not tz:
+                # Fixed offset timezone is packed as seconds of utc offset
+                if tz_data[:1] == b"o":
+                    tz = timezone(timedelta(seconds=struct.unpack_from("<i", tz_data, 1)[0]))
+                else:
+                    tz = ZoneInfo(tz_data[1:].decode())
+                self.timezones[tz_data] = tz
+
+            return dt.replace(tzinfo=tz)
+
+        elif code == EXT_ENUM:
+            return self.enum_members[data]
+
+        elif code == EXT_TUPLE:
+            return tuple(self.loads(data))
+
+        elif code == EXT_PICKLE:
+            return pickle.loads(data)
+
+        return msgpack.ExtType(code, data)
+
+    def get_schema(self) -> str:
+        """
+        Digest of record fields and enum values.
+        """
+        items: list = [("version", MSGPACK_VERSION)]
+
+        for c, names in zip(self.record_classes, self.record_fields):
+            items.append((c.__name__, names))
+
+        for c in self.enum_classes:
+            items.append((c.__name__, tuple(e.value for e in c)))
+
+        return md5(repr(items).encode()).hexdigest()
+
+
+def get_serializers() -> Dict[str, BaseSerializer]:
+    """
+    Get all serializers available, in order of preference.
+    """
+    serializers: Dict[str, BaseSerializer] = {}
+
+    if msgpack:
+        serializers[MsgpackSerializer.name] = MsgpackSerializer()
+
+    serializers[PickleSerializer.name] = PickleSerializer()
+    return serializers
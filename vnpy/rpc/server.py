@@ -1,28 +1,65 @@
 import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from time import time
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
 import zmq
 
-from .common import HEARTBEAT_TOPIC, HEARTBEAT_INTERVAL
+from .common import HEARTBEAT_TOPIC, HEARTBEAT_INTERVAL, NEGOTIATE_FUNCTION, BATCH_FUNCTION, TopicStatistics
+from .serializer import BaseSerializer, get_serializers
 
 
 class RpcServer:
     """"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        serializer: str = "pickle",
+        max_workers: int = 0,
+        batch_size: int = 1,
+        batch_interval: int = 10
+    ) -> None:
         """
         Constructor
+
+        Serializer of request and reply is negotiated with each client,
+        and the one specified here is used for publishing data.
+
+        Requests are executed one by one in server thread by default,
+        which has the lowest latency. Set max_workers larger than 0 for
+        executing requests concurrently in thread pool, only if all
+        registered functions are thread-safe.
+
+        Published data is sent in batches when batch_size is larger than
+        1, and the batch is flushed every batch_interval milliseconds or
+        once batch_size messages are buffered. Messages of the same topic
+        are kept in order.
         """
         # Save functions dict: key is function name, value is function object
         self._functions: Dict[str, Callable] = {}
+        self._functions[NEGOTIATE_FUNCTION] = self.negotiate_serializer
+        self._functions[BATCH_FUNCTION] = self.call_batch
+
+        # Serializer related
+        self._serializers: Dict[str, BaseSerializer] = get_serializers()
+        self._pub_serializer: BaseSerializer = self._serializers[serializer]
 
         # Zmq port related
         self._context: zmq.Context = zmq.Context()
 
-        # Reply socket (Request–reply pattern)
-        self._socket_rep: zmq.Socket = self._context.socket(zmq.REP)
+        # Router socket (Request–reply pattern), compatible with both
+        # REQ and DEALER clients
+        self._socket_rep: zmq.Socket = self._context.socket(zmq.ROUTER)
+
+        # Push/pull socket pair for sending replies from worker threads
+        reply_address: str = f"inproc://rpc_reply_{id(self)}"
+
+        self._socket_pull: zmq.Socket = self._context.socket(zmq.PULL)
+        self._socket_pull.bind(reply_address)
+
+        self._socket_push: zmq.Socket = self._context.socket(zmq.PUSH)
+        self._socket_push.connect(reply_address)
 
         # Publish socket (Publish–subscribe pattern)
         self._socket_pub: zmq.Socket = self._context.socket(zmq.PUB)
@@ -32,6 +69,18 @@ class RpcServer:
         self._thread: threading.Thread = None           # RpcServer thread
         self._lock: threading.Lock = threading.Lock()
 
+        # Thread pool executing requests
+        self._max_workers: int = max_workers
+        self._executor: ThreadPoolExecutor = None
+        self._push_lock: threading.Lock = threading.Lock()
+
+        # Publish batch related
+        self._batch_size: int = batch_size
+        self._batch_interval: int = batch_interval
+        self._batch: Dict[str, list] = {}
+        self._batch_count: int = 0
+        self._pub_statistics: TopicStatistics = TopicStatistics()
+
         # Heartbeat related
         self._heartbeat_at: int = None
 
@@ -57,6 +106,10 @@ class RpcServer:
         # Start RpcServer status
         self._active = True
 
+        # Start worker thread pool
+        if self._max_workers:
+            self._executor = ThreadPoolExecutor(self._max_workers)
+
         # Start RpcServer thread
         self._thread = threading.Thread(target=self.run)
         self._thread.start()
@@ -84,41 +137,174 @@ class RpcServer:
         """
         Run RpcServer functions
         """
+        poller: zmq.Poller = zmq.Poller()
+        poller.register(self._socket_rep, zmq.POLLIN)
+        poller.register(self._socket_pull, zmq.POLLIN)
+
+        if self._batch_size > 1:
+            timeout: int = self._batch_interval
+        else:
+            timeout = 1000
+
         while self._active:
-            # Poll response socket for 1 second
-            n: int = self._socket_rep.poll(1000)
+            # Poll request and reply sockets for 1 second, or batch interval
+            events: dict = dict(poller.poll(timeout))
             self.check_heartbeat()
 
-            if not n:
-                continue
+            if self._batch_count:
+                with self._lock:
+                    self.flush_batch()
 
-            # Receive request data from Reply socket
-            req = self._socket_rep.recv_pyobj()
+            # Send replies finished by worker threads
+            if self._socket_pull in events:
+                while self._socket_pull.poll(0):
+                    self._socket_rep.send_multipart(self._socket_pull.recv_multipart())
 
-            # Get function name and parameters
-            name, args, kwargs = req
+            # Receive requests and execute them in worker threads
+            if self._socket_rep in events:
+                while self._socket_rep.poll(0):
+                    frames: List[bytes] = self._socket_rep.recv_multipart()
 
-            # Try to get and execute callable function object; capture exception information if it fails
-            try:
-                func: Callable = self._functions[name]
-                r: Any = func(*args, **kwargs)
-                rep: list = [True, r]
-            except Exception as e:  # noqa
-                rep: list = [False, traceback.format_exc()]
+                    if self._executor:
+                        self._executor.submit(self.process_in_worker, frames)
+                    else:
+                        self._socket_rep.send_multipart(self.process_request(frames))
 
-            # send callable response by Reply socket
-            self._socket_rep.send_pyobj(rep)
+        # Stop worker thread pool
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+        # Send data left in batch
+        with self._lock:
+            self.flush_batch()
 
         # Unbind socket address
         self._socket_pub.unbind(self._socket_pub.LAST_ENDPOINT)
         self._socket_rep.unbind(self._socket_rep.LAST_ENDPOINT)
 
+    def process_in_worker(self, frames: List[bytes]) -> None:
+        """
+        Execute request in worker thread, and send reply to server thread
+        through inproc socket.
+        """
+        reply: List[bytes] = self.process_request(frames)
+
+        with self._push_lock:
+            self._socket_push.send_multipart(reply)
+
+    def process_request(self, frames: List[bytes]) -> List[bytes]:
+        """
+        Execute request and return frames of reply.
+
+        Frames received are routing envelope ended with empty delimiter,
+        and then request body. Body with single frame is pickled, which is
+        sent by legacy clients. Otherwise the first frame is serializer
+        name, followed by request id from DEALER client if provided.
+
+        Failure of deserializing request or serializing result is replied
+        as [False, traceback] in pickle, so client never waits until timeout.
+        """
+        delimiter: int = frames.index(b"")
+        envelope: List[bytes] = frames[:delimiter + 1]
+        header: List[bytes] = frames[delimiter + 1:-1]
+
+        try:
+            if header:
+                serializer: BaseSerializer = self._serializers[header[0].decode()]
+            else:
+                serializer = self._serializers["pickle"]
+
+            # Get function name and parameters
+            name, args, kwargs = serializer.loads(frames[-1])
+
+            rep: list = self.call_function(name, args, kwargs)
+            data: bytes = serializer.dumps(rep)
+        except Exception:  # noqa
+            if header:
+                header = [b"pickle"] + header[1:]
+
+            data = self._serializers["pickle"].dumps([False, traceback.format_exc()])
+
+        return envelope + header + [data]
+
+    def call_function(self, name: str, args: list, kwargs: dict) -> list:
+        """
+        Execute registered function and return [True, result] if
+        succeeded, or [False, traceback] if failed.
+        """
+        # Try to get and execute callable function object; capture exception information if it fails
+        try:
+            func: Callable = self._functions[name]
+            r: Any = func(*args, **kwargs)
+            rep: list = [True, r]
+        except Exception as e:  # noqa
+            rep: list = [False, traceback.format_exc()]
+
+        return rep
+
+    def call_batch(self, requests: List[list]) -> List[list]:
+        """
+        Execute requests of (name, args, kwargs) one by one, and return
+        reply of each request.
+        """
+        return [self.call_function(name, args, kwargs) for name, args, kwargs in requests]
+
     def publish(self, topic: str, data: Any) -> None:
         """
         Publish data
         """
         with self._lock:
-            self._socket_pub.send_pyobj([topic, data])
+            batch: list = self._batch.get(topic, None)
+            if batch is None:
+                batch = []
+                self._batch[topic] = batch
+
+            batch.append(data)
+            self._batch_count += 1
+
+            if self._batch_count >= self._batch_size:
+                self.flush_batch()
+
+    def flush_batch(self) -> None:
+        """
+        Send buffered data, should be called with lock acquired.
+
+        Data of each topic is sent in frames of topic, serializer name and
+        list of data, so subscriber filters topic without deserializing.
+        """
+        if not self._batch_count:
+            return
+
+        serializer: BaseSerializer = self._pub_serializer
+        name: bytes = serializer.name.encode()
+
+        for topic, batch in self._batch.items():
+            data: bytes = serializer.dumps(batch)
+            self._socket_pub.send_multipart([topic.encode(), name, data])
+            self._pub_statistics.update(topic, len(batch), len(data))
+
+        self._batch = {}
+        self._batch_count = 0
+
+    def get_publish_statistics(self) -> Dict[str, dict]:
+        """
+        Get message count, batch count, bytes and rate of each topic.
+        """
+        with self._lock:
+            return self._pub_statistics.get_statistics()
+
+    def negotiate_serializer(self, candidates: List[Tuple[str, str]]) -> str:
+        """
+        Choose the first serializer in candidates (name, schema) which is
+        supported by server with the same schema.
+        """
+        for name, schema in candidates:
+            serializer: BaseSerializer = self._serializers.get(name, None)
+            if serializer and serializer.get_schema() == schema:
+                return name
+
+        return "pickle"
 
     def register(self, func: Callable) -> None:
         """
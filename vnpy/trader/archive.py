@@ -0,0 +1,468 @@
+"""
+Memory-mapped binary archive of tick data used for tick backtesting.
+"""
+
+import json
+import os
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+from .history import TICK_DTYPE, TICK_FIELDS, BarHistory, TickHistory
+from .database import (
+    BaseDatabase,
+    BarOverview,
+    DB_TZ,
+    TickOverview,
+    convert_tz
+)
+from .utility import get_folder_path
+
+
+# Index of records in each day: day, first row and row count
+INDEX_DTYPE: np.dtype = np.dtype([("day", "<M8[D]"), ("start", "<i8"), ("count", "<i8")])
+
+DATA_FILENAME: str = "data.bin"
+INDEX_FILENAME: str = "index.npy"
+META_FILENAME: str = "meta.json"
+
+
+class TickArchive:
+    """
+    Tick data stored in fixed-width TICK_DTYPE records, one file of each
+    contract sorted by datetime, with index of row range of each day.
+
+    Records are read with numpy.memmap, so opening any range only costs
+    a lookup in day index and a binary search, without parsing data.
+
+    Datetime ranges known to be archived completely are kept in meta file,
+    since archived ticks may only be part of those in database.
+    """
+
+    def __init__(self, folder: Union[str, Path] = None) -> None:
+        """"""
+        if folder:
+            self.root: Path = Path(folder)
+        else:
+            self.root = get_folder_path("tick_archive")
+
+    def get_folder(self, symbol: str, exchange: Exchange) -> Path:
+        """
+        Get folder of contract.
+        """
+        return self.root.joinpath(f"{symbol}.{exchange.value}")
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """
+        Save tick data into archive.
+
+        Ticks later than all archived data are appended to data file,
+        otherwise the file is merged and rewritten with ticks of the same
+        datetime replaced.
+        """
+        if not ticks:
+            return False
+
+        tick: TickData = ticks[0]
+        folder: Path = self.get_folder(tick.symbol, tick.exchange)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        records: np.ndarray = to_records(ticks)
+        records = sort_records(records)
+
+        data_path: Path = folder.joinpath(DATA_FILENAME)
+        index: np.ndarray = self.load_index(folder)
+
+        if len(index):
+            data: np.ndarray = np.memmap(data_path, TICK_DTYPE, "r")
+            append: bool = records["datetime"][0] > data["datetime"][-1]
+            del data
+        else:
+            append = True
+
+        if append:
+            with open(data_path, "ab") as f:
+                f.write(records.tobytes())
+
+            row: int = index["start"][-1] + index["count"][-1] if len(index) else 0
+            index = merge_index(index, build_index(records["datetime"], row))
+        else:
+            data: np.ndarray = np.fromfile(data_path, TICK_DTYPE)
+            data = sort_records(np.concatenate([data, records]))
+
+            temp_path: Path = data_path.with_suffix(".tmp")
+            data.tofile(temp_path)
+            os.replace(temp_path, data_path)
+
+            index = build_index(data["datetime"], 0)
+
+        temp_path: Path = folder.joinpath("index.tmp.npy")
+        np.save(temp_path, index)
+        os.replace(temp_path, folder.joinpath(INDEX_FILENAME))
+
+        meta: dict = self.load_meta(folder)
+        meta["name"] = tick.name
+        self.save_meta(folder, meta)
+
+        return True
+
+    def load_tick_history(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickHistory:
+        """
+        Load ticks between start and end as view of memory-mapped file.
+        """
+        folder: Path = self.get_folder(symbol, exchange)
+        index: np.ndarray = self.load_index(folder)
+
+        name: str = self.load_meta(folder).get("name", "")
+
+        start_dt: np.datetime64 = np.datetime64(to_db_time(start), "us")
+        end_dt: np.datetime64 = np.datetime64(to_db_time(end), "us")
+
+        # Find rows of days in range from index
+        days: np.ndarray = index["day"]
+        first: int = int(np.searchsorted(days, start_dt.astype("datetime64[D]"), "left"))
+        last: int = int(np.searchsorted(days, end_dt.astype("datetime64[D]"), "right"))
+
+        if first >= last:
+            return TickHistory(symbol, exchange, name, np.empty(0, TICK_DTYPE), DB_TZ)
+
+        row_start: int = int(index["start"][first])
+        row_end: int = int(index["start"][last - 1] + index["count"][last - 1])
+
+        data: np.ndarray = np.memmap(folder.joinpath(DATA_FILENAME), TICK_DTYPE, "r")
+        data = data[row_start: row_end]
+
+        # Cut first and last day at exact datetime
+        dt: np.ndarray = data["datetime"]
+        left: int = int(np.searchsorted(dt, start_dt, "left"))
+        right: int = int(np.searchsorted(dt, end_dt, "right"))
+
+        return TickHistory(symbol, exchange, name, data[left: right], DB_TZ)
+
+    def get_days(self, symbol: str, exchange: Exchange) -> List[datetime]:
+        """
+        Get days with tick data archived.
+        """
+        index: np.ndarray = self.load_index(self.get_folder(symbol, exchange))
+        return index["day"].tolist()
+
+    def add_range(self, symbol: str, exchange: Exchange, start: datetime, end: datetime) -> None:
+        """
+        Record that all ticks between start and end are archived.
+        """
+        folder: Path = self.get_folder(symbol, exchange)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        meta: dict = self.load_meta(folder)
+        ranges: List[Tuple[datetime, datetime]] = load_ranges(meta)
+        ranges.append((to_db_time(start), to_db_time(end)))
+
+        meta["ranges"] = [[s.isoformat(), e.isoformat()] for s, e in merge_ranges(ranges)]
+        self.save_meta(folder, meta)
+
+    def check_range(self, symbol: str, exchange: Exchange, start: datetime, end: datetime) -> bool:
+        """
+        Check whether all ticks between start and end are archived.
+        """
+        meta: dict = self.load_meta(self.get_folder(symbol, exchange))
+
+        start = to_db_time(start)
+        end = to_db_time(end)
+
+        for range_start, range_end in load_ranges(meta):
+            if range_start <= start and end <= range_end:
+                return True
+        return False
+
+    def load_meta(self, folder: Path) -> dict:
+        """
+        Load meta data of contract folder.
+        """
+        path: Path = folder.joinpath(META_FILENAME)
+        if not path.exists():
+            return {}
+
+        with open(path, mode="r", encoding="UTF-8") as f:
+            return json.load(f)
+
+    def save_meta(self, folder: Path, meta: dict) -> None:
+        """
+        Save meta data of contract folder.
+        """
+        with open(folder.joinpath(META_FILENAME), mode="w", encoding="UTF-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def load_index(self, folder: Path) -> np.ndarray:
+        """
+        Load day index of contract folder.
+        """
+        path: Path = folder.joinpath(INDEX_FILENAME)
+        if not path.exists():
+            return np.empty(0, INDEX_DTYPE)
+        return np.load(path)
+
+    def delete_tick_data(self, symbol: str, exchange: Exchange) -> None:
+        """
+        Delete archived ticks of contract.
+        """
+        folder: Path = self.get_folder(symbol, exchange)
+        for filename in [DATA_FILENAME, INDEX_FILENAME, META_FILENAME]:
+            path: Path = folder.joinpath(filename)
+            if path.exists():
+                path.unlink()
+
+
+class ArchivedDatabase(BaseDatabase):
+    """
+    Database wrapper which saves tick data into TickArchive as well.
+
+    Used by get_database when database.tick_archive is enabled in
+    SETTINGS, other functions are forwarded to the wrapped database.
+    """
+
+    def __init__(self, database: BaseDatabase, archive: TickArchive) -> None:
+        """"""
+        self.database: BaseDatabase = database
+        self.archive: TickArchive = archive
+
+    def __getattr__(self, name: str):
+        """
+        Forward functions only provided by the wrapped database.
+        """
+        return getattr(self.database, name)
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """"""
+        return self.database.save_bar_data(bars, stream)
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """
+        Save into archive first, since some databases modify tick data
+        objects when saving.
+        """
+        self.archive.save_tick_data(ticks, stream)
+        return self.database.save_tick_data(ticks, stream)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[BarData]:
+        """"""
+        return self.database.load_bar_data(symbol, exchange, interval, start, end)
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> List[TickData]:
+        """"""
+        return self.database.load_tick_data(symbol, exchange, start, end)
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """"""
+        return self.database.load_bar_array(symbol, exchange, interval, start, end)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """"""
+        return self.database.load_tick_array(symbol, exchange, start, end)
+
+    def load_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """"""
+        return self.database.load_bar_frame(symbol, exchange, interval, start, end)
+
+    def load_tick_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """"""
+        return self.database.load_tick_frame(symbol, exchange, start, end)
+
+    def load_bar_history(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarHistory:
+        """"""
+        return self.database.load_bar_history(symbol, exchange, interval, start, end)
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """"""
+        return self.database.delete_bar_data(symbol, exchange, interval)
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """"""
+        self.archive.delete_tick_data(symbol, exchange)
+        return self.database.delete_tick_data(symbol, exchange)
+
+    def get_bar_overview(self) -> List[BarOverview]:
+        """"""
+        return self.database.get_bar_overview()
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """"""
+        return self.database.get_tick_overview()
+
+
+def to_records(ticks: List[TickData]) -> np.ndarray:
+    """
+    Convert tick data into TICK_DTYPE records.
+    """
+    records: np.ndarray = np.empty(len(ticks), TICK_DTYPE)
+
+    records["datetime"] = [convert_tz(tick.datetime) for tick in ticks]
+    records["localtime"] = [
+        to_db_time(tick.localtime) if tick.localtime else None for tick in ticks
+    ]
+
+    # Missing depth data may be None when loaded from database
+    getter: Callable = attrgetter(*TICK_FIELDS)
+    values: np.ndarray = np.array([getter(tick) for tick in ticks], dtype=float)
+    values = np.nan_to_num(values, copy=False)
+
+    for i, name in enumerate(TICK_FIELDS):
+        records[name] = values[:, i]
+
+    return records
+
+
+def sort_records(records: np.ndarray) -> np.ndarray:
+    """
+    Sort records by datetime, keeping the last one of the same datetime.
+    """
+    dt: np.ndarray = records["datetime"]
+
+    # Already sorted without duplicate
+    if np.all(dt[1:] > dt[:-1]):
+        return records
+
+    order: np.ndarray = np.argsort(dt, kind="stable")
+    sorted_dt: np.ndarray = dt[order]
+
+    last: np.ndarray = np.ones(len(sorted_dt), dtype=bool)
+    last[:-1] = sorted_dt[1:] != sorted_dt[:-1]
+
+    return records[order[last]]
+
+
+def build_index(dt: np.ndarray, row: int) -> np.ndarray:
+    """
+    Build day index of sorted datetime array starting from row.
+    """
+    days: np.ndarray = dt.astype("datetime64[D]")
+    unique_days, starts, counts = np.unique(days, return_index=True, return_counts=True)
+
+    index: np.ndarray = np.empty(len(unique_days), INDEX_DTYPE)
+    index["day"] = unique_days
+    index["start"] = starts + row
+    index["count"] = counts
+    return index
+
+
+def merge_index(index: np.ndarray, new_index: np.ndarray) -> np.ndarray:
+    """
+    Merge index of appended records, which may continue the last day.
+    """
+    if len(index) and len(new_index) and index["day"][-1] == new_index["day"][0]:
+        index = index.copy()
+        index["count"][-1] += new_index["count"][0]
+        new_index = new_index[1:]
+
+    return np.concatenate([index, new_index])
+
+
+def load_ranges(meta: dict) -> List[Tuple[datetime, datetime]]:
+    """
+    Load archived datetime ranges from meta data.
+    """
+    return [
+        (datetime.fromisoformat(start), datetime.fromisoformat(end))
+        for start, end in meta.get("ranges", [])
+    ]
+
+
+def merge_ranges(ranges: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """
+    Merge overlapping datetime ranges.
+    """
+    merged: List[Tuple[datetime, datetime]] = []
+
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def to_db_time(dt: datetime) -> datetime:
+    """
+    Convert datetime into DB_TZ, naive datetime is regarded as in DB_TZ.
+    """
+    if dt.tzinfo:
+        return convert_tz(dt)
+    return dt
+
+
+tick_archive: Optional[TickArchive] = None
+
+
+def get_tick_archive() -> TickArchive:
+    """"""
+    global tick_archive
+    if not tick_archive:
+        tick_archive = TickArchive()
+    return tick_archive
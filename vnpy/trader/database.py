@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from types import ModuleType
-from typing import List
+from typing import Dict, List
 from dataclasses import dataclass
 from importlib import import_module
 
+import numpy as np
+import pandas as pd
+
 from .constant import Interval, Exchange
 from .object import BarData, TickData
+from .history import BAR_FIELDS, TICK_FIELDS, BarHistory
 from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
@@ -133,6 +137,108 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load bar data as numpy arrays of datetime and BAR_FIELDS.
+
+        Datetime is datetime64[us] of wall clock time in DB_TZ, and other
+        fields are float64. The default implementation converts result of
+        load_bar_data, so databases should override it for reading columns
+        without creating objects of each row.
+        """
+        bars: List[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+
+        arrays: Dict[str, np.ndarray] = {
+            "datetime": np.array([convert_tz(bar.datetime) for bar in bars], dtype="datetime64[us]")
+        }
+        for name in BAR_FIELDS:
+            arrays[name] = np.array([getattr(bar, name) for bar in bars], dtype=float)
+
+        return arrays
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load tick data as numpy arrays of datetime and TICK_FIELDS.
+
+        Same as load_bar_array, missing depth data is loaded as nan.
+        """
+        ticks: List[TickData] = self.load_tick_data(symbol, exchange, start, end)
+
+        arrays: Dict[str, np.ndarray] = {
+            "datetime": np.array([convert_tz(tick.datetime) for tick in ticks], dtype="datetime64[us]")
+        }
+        for name in TICK_FIELDS:
+            arrays[name] = np.array([getattr(tick, name) for tick in ticks], dtype=float)
+
+        return arrays
+
+    def load_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Load bar data as DataFrame of BAR_FIELDS indexed by datetime in DB_TZ.
+        """
+        arrays: Dict[str, np.ndarray] = self.load_bar_array(symbol, exchange, interval, start, end)
+        return to_frame(arrays)
+
+    def load_tick_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Load tick data as DataFrame of TICK_FIELDS indexed by datetime in DB_TZ.
+        """
+        arrays: Dict[str, np.ndarray] = self.load_tick_array(symbol, exchange, start, end)
+        return to_frame(arrays)
+
+    def load_bar_history(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarHistory:
+        """
+        Load bar data into columnar history container used by backtesting.
+        """
+        arrays: Dict[str, np.ndarray] = self.load_bar_array(symbol, exchange, interval, start, end)
+        dt: np.ndarray = arrays.pop("datetime")
+        return BarHistory(symbol, exchange, interval, dt, arrays, DB_TZ)
+
+
+def to_frame(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Convert arrays loaded from database into DataFrame indexed by datetime.
+    """
+    data: Dict[str, np.ndarray] = dict(arrays)
+
+    index: pd.DatetimeIndex = pd.DatetimeIndex(data.pop("datetime"), name="datetime")
+    index = index.tz_localize(DB_TZ.key)
+
+    return pd.DataFrame(data, index=index, copy=False)
+
 
 database: BaseDatabase = None
 
@@ -157,4 +263,10 @@ def get_database() -> BaseDatabase:
 
     # Create database object from module
     database = module.Database()
+
+    # Save tick data into memory-mapped archive as well for backtesting
+    if SETTINGS["database.tick_archive"]:
+        from .archive import ArchivedDatabase, get_tick_archive
+        database = ArchivedDatabase(database, get_tick_archive())
+
     return database
@@ -226,6 +226,26 @@ class MainEngine:
         else:
             return None
 
+    def start_profiling(self, interval: int = 10) -> None:
+        """
+        Start profiling event engine, report is published as EVENT_PROFILE
+        every interval seconds.
+        """
+        self.event_engine.start_profiling(interval)
+
+    def stop_profiling(self) -> None:
+        """
+        Stop profiling event engine.
+        """
+        self.event_engine.stop_profiling()
+
+    def get_event_profile(self) -> dict:
+        """
+        Get queue latency of each event type, execution time of each
+        handler and queue depth history of event engine.
+        """
+        return self.event_engine.get_profile()
+
     def close(self) -> None:
         """
         Make sure every gateway and app is closed properly before
@@ -2,7 +2,7 @@
 Event type string used in the trading platform.
 """
 
-from vnpy.event import EVENT_TIMER  # noqa
+from vnpy.event import EVENT_TIMER, EVENT_PROFILE, PRIORITY_HIGH, PRIORITY_LOW  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_TRADE = "eTrade."
@@ -12,3 +12,11 @@ EVENT_ACCOUNT = "eAccount."
 EVENT_QUOTE = "eQuote."
 EVENT_CONTRACT = "eContract."
 EVENT_LOG = "eLog"
+
+# Priorities of event types used by PriorityEventEngine
+EVENT_PRIORITIES = {
+    EVENT_ORDER: PRIORITY_HIGH,
+    EVENT_TRADE: PRIORITY_HIGH,
+    EVENT_TICK: PRIORITY_LOW,
+    EVENT_TIMER: PRIORITY_LOW
+}
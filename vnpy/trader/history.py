@@ -0,0 +1,399 @@
+"""
+Columnar container of history data used for backtesting.
+"""
+
+import pickle
+from datetime import datetime, tzinfo
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+
+
+BAR_FIELDS: List[str] = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "turnover",
+    "open_interest"
+]
+
+TICK_FIELDS: List[str] = [
+    "volume",
+    "turnover",
+    "open_interest",
+    "last_price",
+    "last_volume",
+    "limit_up",
+    "limit_down",
+    "open_price",
+    "high_price",
+    "low_price",
+    "pre_close",
+    "bid_price_1",
+    "bid_price_2",
+    "bid_price_3",
+    "bid_price_4",
+    "bid_price_5",
+    "ask_price_1",
+    "ask_price_2",
+    "ask_price_3",
+    "ask_price_4",
+    "ask_price_5",
+    "bid_volume_1",
+    "bid_volume_2",
+    "bid_volume_3",
+    "bid_volume_4",
+    "bid_volume_5",
+    "ask_volume_1",
+    "ask_volume_2",
+    "ask_volume_3",
+    "ask_volume_4",
+    "ask_volume_5"
+]
+
+# Fixed-width record of tick data, name of contract is not included
+TICK_DTYPE: np.dtype = np.dtype(
+    [("datetime", "<M8[us]")]
+    + [(name, "<f8") for name in TICK_FIELDS]
+    + [("localtime", "<M8[us]")]
+)
+
+CHUNK_SIZE: int = 10_000
+
+
+class BarHistory:
+    """
+    Bar data of one contract stored in numpy arrays.
+
+    Datetime is stored as datetime64[us] of wall clock time in tz, and
+    other fields as float64 arrays. BarData objects are only created when
+    accessed by index or iteration, so the container supports most read
+    operations of List[BarData] while taking much less memory.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        datetime: np.ndarray,
+        data: Dict[str, np.ndarray],
+        tz: Optional[tzinfo] = None,
+        gateway_name: str = "DB"
+    ) -> None:
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.interval: Interval = interval
+        self.tz: Optional[tzinfo] = tz
+        self.gateway_name: str = gateway_name
+
+        self.datetime: np.ndarray = datetime
+        self.data: Dict[str, np.ndarray] = data
+
+    @classmethod
+    def from_bars(
+        cls,
+        bars: Sequence[BarData],
+        symbol: str = "",
+        exchange: Exchange = None,
+        interval: Interval = None
+    ) -> "BarHistory":
+        """
+        Create history container from list of bar data.
+        """
+        if bars:
+            first: BarData = bars[0]
+            symbol = first.symbol
+            exchange = first.exchange
+            interval = first.interval
+            tz: Optional[tzinfo] = first.datetime.tzinfo
+            gateway_name: str = first.gateway_name
+        else:
+            tz = None
+            gateway_name = "DB"
+
+        dt: np.ndarray = np.array(
+            [bar.datetime.replace(tzinfo=None) for bar in bars],
+            dtype="datetime64[us]"
+        )
+
+        data: Dict[str, np.ndarray] = {}
+        for name in BAR_FIELDS:
+            data[name] = np.array([getattr(bar, name) for bar in bars], dtype=float)
+
+        return cls(symbol, exchange, interval, dt, data, tz, gateway_name)
+
+    @classmethod
+    def concatenate(cls, histories: List["BarHistory"]) -> "BarHistory":
+        """
+        Join multiple history containers of the same contract.
+        """
+        # Use attributes of the first non-empty container
+        first: BarHistory = histories[0]
+        for history in histories:
+            if len(history):
+                first = history
+                break
+
+        dt: np.ndarray = np.concatenate([h.datetime for h in histories])
+
+        data: Dict[str, np.ndarray] = {}
+        for name in BAR_FIELDS:
+            data[name] = np.concatenate([h.data[name] for h in histories])
+
+        return cls(
+            first.symbol,
+            first.exchange,
+            first.interval,
+            dt,
+            data,
+            first.tz,
+            first.gateway_name
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by all arrays.
+        """
+        return self.datetime.nbytes + sum(a.nbytes for a in self.data.values())
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.datetime)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BarData, "BarHistory"]:
+        """
+        Get bar data by index, or a history view by slice.
+        """
+        if isinstance(index, slice):
+            data: Dict[str, np.ndarray] = {k: v[index] for k, v in self.data.items()}
+
+            return BarHistory(
+                self.symbol,
+                self.exchange,
+                self.interval,
+                self.datetime[index],
+                data,
+                self.tz,
+                self.gateway_name
+            )
+
+        dt: datetime = self.datetime[index].item()
+        values: list = [float(self.data[name][index]) for name in BAR_FIELDS]
+        return self.create_bar(dt, *values)
+
+    def __iter__(self) -> Iterator[BarData]:
+        """
+        Create bar data one by one, converting arrays chunk by chunk.
+        """
+        arrays: List[np.ndarray] = [self.data[name] for name in BAR_FIELDS]
+
+        symbol: str = self.symbol
+        exchange: Exchange = self.exchange
+        interval: Interval = self.interval
+        tz: Optional[tzinfo] = self.tz
+        gateway_name: str = self.gateway_name
+
+        for i in range(0, len(self), CHUNK_SIZE):
+            dts: list = self.datetime[i: i + CHUNK_SIZE].tolist()
+            if tz:
+                dts = [dt.replace(tzinfo=tz) for dt in dts]
+
+            columns: List[list] = [a[i: i + CHUNK_SIZE].tolist() for a in arrays]
+
+            for dt, open_price, high_price, low_price, close_price, volume, turnover, open_interest in zip(dts, *columns):
+                yield BarData(
+                    symbol=symbol,
+                    exchange=exchange,
+                    datetime=dt,
+                    interval=interval,
+                    volume=volume,
+                    turnover=turnover,
+                    open_interest=open_interest,
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    gateway_name=gateway_name
+                )
+
+    def create_bar(
+        self,
+        dt: datetime,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        volume: float,
+        turnover: float,
+        open_interest: float
+    ) -> BarData:
+        """
+        Create bar data object from field values.
+        """
+        if self.tz:
+            dt = dt.replace(tzinfo=self.tz)
+
+        return BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=dt,
+            interval=self.interval,
+            volume=volume,
+            turnover=turnover,
+            open_interest=open_interest,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            close_price=close_price,
+            gateway_name=self.gateway_name
+        )
+
+    def to_bars(self) -> List[BarData]:
+        """
+        Convert into list of bar data.
+        """
+        return list(self)
+
+    def save(self, folder: Union[str, Path]) -> None:
+        """
+        Save arrays into npy files under folder, which can be loaded as
+        memory-mapped arrays later.
+        """
+        folder: Path = Path(folder)
+
+        np.save(folder.joinpath("datetime.npy"), self.datetime)
+
+        data: np.ndarray = np.stack([self.data[name] for name in BAR_FIELDS])
+        np.save(folder.joinpath("data.npy"), data)
+
+        meta: dict = {
+            "symbol": self.symbol,
+            "exchange": self.exchange,
+            "interval": self.interval,
+            "tz": self.tz,
+            "gateway_name": self.gateway_name
+        }
+        with open(folder.joinpath("meta.pkl"), "wb") as f:
+            pickle.dump(meta, f)
+
+    @classmethod
+    def load(cls, folder: Union[str, Path], mmap: bool = True) -> "BarHistory":
+        """
+        Load history saved under folder. With mmap enabled, arrays are
+        memory-mapped read only, so processes loading the same folder share
+        one copy of data in page cache.
+        """
+        folder: Path = Path(folder)
+        mmap_mode: Optional[str] = "r" if mmap else None
+
+        dt: np.ndarray = np.load(folder.joinpath("datetime.npy"), mmap_mode=mmap_mode)
+        data_array: np.ndarray = np.load(folder.joinpath("data.npy"), mmap_mode=mmap_mode)
+        data: Dict[str, np.ndarray] = dict(zip(BAR_FIELDS, data_array))
+
+        with open(folder.joinpath("meta.pkl"), "rb") as f:
+            meta: dict = pickle.load(f)
+
+        return cls(datetime=dt, data=data, **meta)
+
+
+class TickHistory:
+    """
+    Tick data of one contract stored in numpy structured array.
+
+    Records are in TICK_DTYPE with datetime of wall clock time in tz, so
+    the array can be a memory-mapped file. TickData objects are only
+    created when accessed by index or iteration.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        name: str,
+        data: np.ndarray,
+        tz: Optional[tzinfo] = None,
+        gateway_name: str = "DB"
+    ) -> None:
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.name: str = name
+        self.tz: Optional[tzinfo] = tz
+        self.gateway_name: str = gateway_name
+
+        self.data: np.ndarray = data
+
+    @property
+    def datetime(self) -> np.ndarray:
+        """"""
+        return self.data["datetime"]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.data)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TickData, "TickHistory"]:
+        """
+        Get tick data by index, or a history view by slice.
+        """
+        if isinstance(index, slice):
+            return TickHistory(
+                self.symbol,
+                self.exchange,
+                self.name,
+                self.data[index],
+                self.tz,
+                self.gateway_name
+            )
+
+        size: int = len(self.data)
+        if index < 0:
+            index += size
+
+        if not 0 <= index < size:
+            raise IndexError("tick history index out of range")
+
+        return next(iter(self[index: index + 1]))
+
+    def __iter__(self) -> Iterator[TickData]:
+        """
+        Create tick data one by one, converting records chunk by chunk.
+        """
+        tz: Optional[tzinfo] = self.tz
+
+        for i in range(0, len(self), CHUNK_SIZE):
+            chunk: np.ndarray = self.data[i: i + CHUNK_SIZE]
+
+            dts: list = chunk["datetime"].tolist()
+            if tz:
+                dts = [dt.replace(tzinfo=tz) for dt in dts]
+
+            localtimes: list = chunk["localtime"].tolist()
+            columns: List[list] = [chunk[name].tolist() for name in TICK_FIELDS]
+
+            for dt, localtime, *values in zip(dts, localtimes, *columns):
+                tick: TickData = TickData(
+                    symbol=self.symbol,
+                    exchange=self.exchange,
+                    datetime=dt,
+                    name=self.name,
+                    localtime=localtime,
+                    gateway_name=self.gateway_name,
+                    **dict(zip(TICK_FIELDS, values))
+                )
+                yield tick
+
+    def to_ticks(self) -> List[TickData]:
+        """
+        Convert into list of tick data.
+        """
+        return list(self)
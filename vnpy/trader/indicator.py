@@ -0,0 +1,270 @@
+"""
+Streaming technical indicators updated in O(1) per bar.
+
+The calculation follows TA-Lib algorithm of each indicator, so once loaded
+with the same input series, the latest value matches TA-Lib result.
+
+Notice that TA-Lib recursive indicators (EMA/ATR/RSI) applied on the fixed
+size window of ArrayManager are re-seeded from the window start on every
+call, while streaming ones keep the whole history. The difference decays
+exponentially and is negligible when window size is much larger than n.
+"""
+
+from collections import deque
+from math import nan, sqrt
+from typing import Deque, Tuple
+
+import numpy as np
+
+
+class StreamIndicator:
+    """
+    Base class of streaming indicator.
+
+    Every indicator is fed with high/low/close price of each bar, and
+    keeps the latest indicator value in the value attribute (nan before
+    enough data is received).
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        self.n: int = n
+        self.count: int = 0
+        self.value: float = nan
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """
+        Update indicator with new bar prices.
+        """
+        pass
+
+    def load(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        """
+        Replay price series to initialize indicator state.
+        """
+        for h, l, c in zip(high.tolist(), low.tolist(), close.tolist()):
+            self.update(h, l, c)
+
+
+class SmaIndicator(StreamIndicator):
+    """
+    Simple moving average of close price, based on running sum.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.window: Deque[float] = deque()
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        self.window.append(close)
+        total: float = self.total + close
+
+        if self.count >= self.n:
+            self.value = total / self.n
+            total -= self.window.popleft()
+
+        self.total = total
+
+
+class EmaIndicator(StreamIndicator):
+    """
+    Exponential moving average of close price, seeded with SMA.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.k: float = 2 / (n + 1)
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+
+        if self.count < self.n:
+            self.total += close
+        elif self.count == self.n:
+            self.value = (self.total + close) / self.n
+        else:
+            self.value = (close - self.value) * self.k + self.value
+
+
+class StdIndicator(StreamIndicator):
+    """
+    Population standard deviation of close price, based on sliding
+    window Welford algorithm.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.window: Deque[float] = deque()
+        self.mean: float = 0
+        self.m2: float = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        self.window.append(close)
+
+        if self.count <= self.n:
+            delta: float = close - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (close - self.mean)
+        else:
+            old: float = self.window.popleft()
+            old_mean: float = self.mean
+            self.mean += (close - old) / self.n
+            self.m2 += (close - old) * (close - self.mean + old - old_mean)
+
+        if self.count >= self.n:
+            variance: float = self.m2 / self.n
+
+            # Same zero threshold as TA-Lib
+            if variance < 1e-8:
+                self.value = 0
+            else:
+                self.value = sqrt(variance)
+
+
+class AtrIndicator(StreamIndicator):
+    """
+    Average true range with Wilder smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.pre_close: float = nan
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        # True range is not available for the first bar
+        if self.count == 1:
+            return
+
+        tr: float = max(high, pre_close) - min(low, pre_close)
+        n: int = self.n
+
+        if n <= 1:
+            self.value = tr
+        elif self.count <= n:
+            self.total += tr
+        elif self.count == n + 1:
+            self.value = (self.total + tr) / n
+        else:
+            self.value = (self.value * (n - 1) + tr) / n
+
+
+class RsiIndicator(StreamIndicator):
+    """
+    Relative strength index with Wilder smoothing.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.pre_close: float = nan
+        self.gain: float = 0
+        self.loss: float = 0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        pre_close: float = self.pre_close
+        self.pre_close = close
+
+        if self.count == 1:
+            return
+
+        diff: float = close - pre_close
+        gain: float = diff if diff > 0 else 0
+        loss: float = -diff if diff < 0 else 0
+        n: int = self.n
+
+        if self.count <= n + 1:
+            self.gain += gain
+            self.loss += loss
+
+            if self.count < n + 1:
+                return
+
+            self.gain /= n
+            self.loss /= n
+        else:
+            self.gain = (self.gain * (n - 1) + gain) / n
+            self.loss = (self.loss * (n - 1) + loss) / n
+
+        total: float = self.gain + self.loss
+        if -1e-8 < total < 1e-8:
+            self.value = 0
+        else:
+            self.value = 100 * (self.gain / total)
+
+
+class MaxIndicator(StreamIndicator):
+    """
+    Highest high price in window, based on monotonic deque.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.window: Deque[Tuple[int, float]] = deque()
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        window: Deque[Tuple[int, float]] = self.window
+
+        while window and window[-1][1] <= high:
+            window.pop()
+        window.append((self.count, high))
+
+        if window[0][0] <= self.count - self.n:
+            window.popleft()
+
+        if self.count >= self.n:
+            self.value = window[0][1]
+
+
+class MinIndicator(StreamIndicator):
+    """
+    Lowest low price in window, based on monotonic deque.
+    """
+
+    def __init__(self, n: int) -> None:
+        """"""
+        super().__init__(n)
+
+        self.window: Deque[Tuple[int, float]] = deque()
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """"""
+        self.count += 1
+        window: Deque[Tuple[int, float]] = self.window
+
+        while window and window[-1][1] >= low:
+            window.pop()
+        window.append((self.count, low))
+
+        if window[0][0] <= self.count - self.n:
+            window.popleft()
+
+        if self.count >= self.n:
+            self.value = window[0][1]
@@ -1,10 +1,14 @@
-from typing import Dict, List, Callable, Tuple
-from itertools import product
+from typing import Dict, List, Callable, Tuple, Iterator, Optional, ContextManager
+from contextlib import nullcontext
+from functools import partial
+from math import ceil
+from itertools import product, islice
 from concurrent.futures import ProcessPoolExecutor
 from random import random, choice
 from time import perf_counter
 from multiprocessing import get_context
-from multiprocessing.context import BaseContext
+from pathlib import Path
+import pickle
 from _collections_abc import dict_keys, dict_values, Iterable
 
 from tqdm import tqdm
@@ -12,10 +16,18 @@ from deap import creator, base, tools, algorithms
 
 from .locale import _
 
+try:
+    import resource
+except ImportError:
+    resource = None         # Not available on Windows
+
 OUTPUT_FUNC = Callable[[str], None]
 EVALUATE_FUNC = Callable[[dict], dict]
 KEY_FUNC = Callable[[list], float]
 
+# Number of settings submitted to worker processes at a time
+CHUNK_SIZE: int = 10_000
+
 
 # Create individual class used in genetic algorithm optimization
 creator.create("FitnessMax", base.Fitness, weights=(1.0,))
@@ -67,16 +79,136 @@ class OptimizationSetting:
 
     def generate_settings(self) -> List[dict]:
         """"""
+        return list(self.iter_settings())
+
+    def count_settings(self) -> int:
+        """
+        Get size of parameter space without generating settings.
+        """
+        count: int = 1
+        for values in self.params.values():
+            count *= len(values)
+        return count
+
+    def iter_settings(self) -> Iterator[dict]:
+        """
+        Generate settings one by one, in the same order as generate_settings.
+        """
         keys: dict_keys = self.params.keys()
         values: dict_values = self.params.values()
-        products: list = list(product(*values))
 
-        settings: list = []
-        for p in products:
-            setting: dict = dict(zip(keys, p))
-            settings.append(setting)
+        for p in product(*values):
+            yield dict(zip(keys, p))
+
+    def get_setting(self, index: int) -> dict:
+        """
+        Get setting by index in parameter space, which is decoded as a
+        mixed-radix number with the last parameter changing fastest.
+        """
+        items: list = []
+
+        for name, values in reversed(self.params.items()):
+            index, i = divmod(index, len(values))
+            items.append((name, values[i]))
+
+        return dict(reversed(items))
+
+    def sample_setting(self) -> dict:
+        """
+        Get a random setting from parameter space with equal probability.
+        """
+        return {name: choice(values) for name, values in self.params.items()}
+
+
+class OptimizationPool:
+    """
+    Long-lived process pool for running optimization repeatedly.
+
+    Each worker runs initializer once when started, so data loaded there
+    is reused by all tasks of successive optimization runs. Memory limit
+    (MB) of each worker process is only supported on POSIX system.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        initializer: Callable = None,
+        initargs: tuple = (),
+        memory_limit: int = 0
+    ) -> None:
+        """"""
+        self.max_workers: int = max_workers
+        self.memory_limit: int = memory_limit
+
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers,
+            mp_context=get_context("spawn"),
+            initializer=init_pool_worker,
+            initargs=(memory_limit, initializer, initargs)
+        )
+
+    def map(self, func: Callable, iterable: Iterable, chunksize: int = 1) -> Iterator:
+        """
+        Run func with every item of iterable in worker processes.
+        """
+        return self.executor.map(func, iterable, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all worker processes.
+        """
+        self.executor.shutdown(wait)
+
+    def __enter__(self) -> "OptimizationPool":
+        """"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """"""
+        self.shutdown()
+
+
+def init_pool_worker(
+    memory_limit: int,
+    initializer: Optional[Callable],
+    initargs: tuple
+) -> None:
+    """
+    Initialize worker process of optimization pool.
+    """
+    if memory_limit and resource:
+        limit: int = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if initializer:
+        initializer(*initargs)
+
+
+def map_in_chunks(
+    map_func: Callable,
+    func: Callable,
+    iterable: Iterable,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator:
+    """
+    Map func over iterable chunk by chunk, so that only two chunks of
+    arguments are submitted at the same time. Next chunk is submitted
+    before results of current one are consumed to keep workers busy.
+    """
+    it: Iterator = iter(iterable)
+
+    chunk: list = list(islice(it, chunk_size))
+    results: Iterator = map_func(func, chunk)
+
+    while chunk:
+        chunk = list(islice(it, chunk_size))
+        if chunk:
+            next_results: Iterator = map_func(func, chunk)
 
-        return settings
+        yield from results
+
+        if chunk:
+            results = next_results
 
 
 def check_optimization_setting(
@@ -84,7 +216,7 @@ def check_optimization_setting(
     output: OUTPUT_FUNC = print
 ) -> bool:
     """"""
-    if not optimization_setting.generate_settings():
+    if not optimization_setting.count_settings():
         output(_("优化参数组合为空，请检查"))
         return False
 
@@ -100,32 +232,117 @@ def run_bf_optimization(
     optimization_setting: OptimizationSetting,
     key_func: KEY_FUNC,
     max_workers: int = None,
-    output: OUTPUT_FUNC = print
+    output: OUTPUT_FUNC = print,
+    pool: OptimizationPool = None
 ) -> List[Tuple]:
     """Run brutal force optimization"""
-    settings: List[Dict] = optimization_setting.generate_settings()
+    settings: Iterator[Dict] = optimization_setting.iter_settings()
+    total_size: int = optimization_setting.count_settings()
 
     output(_("开始执行穷举算法优化"))
-    output(_("参数优化空间：{}").format(len(settings)))
+    output(_("参数优化空间：{}").format(total_size))
 
     start: int = perf_counter()
 
-    with ProcessPoolExecutor(
-        max_workers,
-        mp_context=get_context("spawn")
-    ) as executor:
+    # Use persistent pool if provided, otherwise create a temporary one
+    if pool:
         it: Iterable = tqdm(
-            executor.map(evaluate_func, settings),
-            total=len(settings)
+            map_in_chunks(pool.map, evaluate_func, settings),
+            total=total_size
         )
         results: List[Tuple] = list(it)
-        results.sort(reverse=True, key=key_func)
+    else:
+        with ProcessPoolExecutor(
+            max_workers,
+            mp_context=get_context("spawn")
+        ) as executor:
+            it: Iterable = tqdm(
+                map_in_chunks(executor.map, evaluate_func, settings),
+                total=total_size
+            )
+            results: List[Tuple] = list(it)
 
-        end: int = perf_counter()
-        cost: int = int((end - start))
-        output(_("穷举算法优化完成，耗时{}秒").format(cost))
+    results.sort(reverse=True, key=key_func)
 
-        return results
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(_("穷举算法优化完成，耗时{}秒").format(cost))
+
+    return results
+
+
+def run_sh_optimization(
+    evaluate_func: EVALUATE_FUNC,
+    optimization_setting: OptimizationSetting,
+    key_func: KEY_FUNC,
+    max_workers: int = None,
+    eta: int = 3,
+    min_fraction: float = 0.1,
+    output: OUTPUT_FUNC = print,
+    pool: OptimizationPool = None
+) -> List[Tuple]:
+    """
+    Run successive halving optimization.
+
+    All settings are evaluated on a short prefix of history first, then
+    only the top 1/eta of them survive to next round with eta times longer
+    history, until the full history is used for the finalists.
+
+    Evaluate function should accept fraction of history as keyword
+    argument, and return result with setting as the first element.
+    """
+    if eta <= 1:
+        output(_("减半系数必须大于1，请检查"))
+        return []
+
+    if not 0 < min_fraction <= 1:
+        output(_("最小历史数据比例必须在0到1之间，请检查"))
+        return []
+
+    fractions: List[float] = [1]
+    while fractions[0] / eta >= min_fraction:
+        fractions.insert(0, fractions[0] / eta)
+
+    output(_("开始执行连续减半算法优化"))
+    output(_("参数优化空间：{}").format(optimization_setting.count_settings()))
+    output(_("筛选轮数：{}").format(len(fractions)))
+
+    start: int = perf_counter()
+
+    # Use persistent pool if provided, otherwise create a temporary one
+    if pool:
+        executor: ContextManager = nullcontext(pool)
+    else:
+        executor: ContextManager = ProcessPoolExecutor(
+            max_workers,
+            mp_context=get_context("spawn")
+        )
+
+    settings: Iterable = optimization_setting.iter_settings()
+    total_size: int = optimization_setting.count_settings()
+
+    with executor as executor:
+        for n, fraction in enumerate(fractions):
+            output(_("第{}轮，历史数据比例：{:.0%}，参数组合数量：{}").format(n + 1, fraction, total_size))
+
+            func: Callable = partial(evaluate_func, fraction=fraction)
+            it: Iterable = tqdm(
+                map_in_chunks(executor.map, func, settings),
+                total=total_size
+            )
+            results: List[Tuple] = list(it)
+            results.sort(reverse=True, key=key_func)
+
+            # Keep top results for next round
+            if fraction < 1:
+                total_size = max(ceil(len(results) / eta), 1)
+                settings = [result[0] for result in results[:total_size]]
+
+    end: int = perf_counter()
+    cost: int = int((end - start))
+    output(_("连续减半算法优化完成，耗时{}秒").format(cost))
+
+    return results
 
 
 def run_ga_optimization(
@@ -135,16 +352,20 @@ def run_ga_optimization(
     max_workers: int = None,
     population_size: int = 100,
     ngen_size: int = 30,
-    output: OUTPUT_FUNC = print
+    output: OUTPUT_FUNC = print,
+    pool: OptimizationPool = None,
+    cache_path: Optional[Path] = None
 ) -> List[Tuple]:
-    """Run genetic algorithm optimization"""
-    # Define functions for generate parameter randomly
-    buf: List[Dict] = optimization_setting.generate_settings()
-    settings: List[Tuple] = [list(d.items()) for d in buf]
+    """
+    Run genetic algorithm optimization.
 
+    Evaluated results are cached in parent process, and persisted into
+    cache_path if provided, so repeated runs skip evaluated parameters.
+    """
+    # Define functions for generate parameter randomly
     def generate_parameter() -> list:
         """"""
-        return choice(settings)
+        return list(optimization_setting.sample_setting().items())
 
     def mutate_individual(individual: list, indpb: float) -> tuple:
         """"""
@@ -155,12 +376,36 @@ def run_ga_optimization(
                 individual[i] = paramlist[i]
         return individual,
 
-    # Set up multiprocessing Pool and Manager
-    ctx: BaseContext = get_context("spawn")
-    with ctx.Manager() as manager, ctx.Pool(max_workers) as pool:
-        # Create shared dict for result cache
-        cache: Dict[Tuple, Tuple] = manager.dict()
+    # Result cache kept in parent process, loaded from file if provided
+    cache: Dict[Tuple, Tuple] = load_result_cache(cache_path)
+    used_keys: set = set()
+
+    def evaluate_population(func: Callable, population: list) -> List[tuple]:
+        """
+        Evaluate fitness of population. Cached parameters are skipped, and
+        duplicate individuals are only dispatched to workers once.
+        """
+        keys: List[tuple] = [tuple(individual) for individual in population]
+        used_keys.update(keys)
+
+        new_keys: List[tuple] = [key for key in dict.fromkeys(keys) if key not in cache]
+        settings: List[dict] = [dict(key) for key in new_keys]
+
+        for key, result in zip(new_keys, executor.map(func, settings)):
+            cache[key] = result
+
+        return [(key_func(cache[key]),) for key in keys]
+
+    # Set up process pool, persistent pool is not closed after run
+    if pool:
+        context: ContextManager = nullcontext(pool)
+    else:
+        context: ContextManager = ProcessPoolExecutor(
+            max_workers,
+            mp_context=get_context("spawn")
+        )
 
+    with context as executor:
         # Set up toolbox
         toolbox: base.Toolbox = base.Toolbox()
         toolbox.register("individual", tools.initIterate, creator.Individual, generate_parameter)
@@ -168,16 +413,10 @@ def run_ga_optimization(
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", mutate_individual, indpb=1)
         toolbox.register("select", tools.selNSGA2)
-        toolbox.register("map", pool.map)
-        toolbox.register(
-            "evaluate",
-            ga_evaluate,
-            cache,
-            evaluate_func,
-            key_func
-        )
+        toolbox.register("map", evaluate_population)
+        toolbox.register("evaluate", evaluate_func)
 
-        total_size: int = len(settings)
+        total_size: int = optimization_setting.count_settings()
         pop_size: int = population_size                      # number of individuals in each generation
         lambda_: int = pop_size                              # number of children to produce at each generation
         mu: int = int(pop_size * 0.8)                        # number of individuals to select for the next generation
@@ -215,27 +454,31 @@ def run_ga_optimization(
 
         output(_("遗传算法优化完成，耗时{}秒").format(cost))
 
-        results: list = list(cache.values())
-        results.sort(reverse=True, key=key_func)
-        return results
+    save_result_cache(cache_path, cache)
 
+    results: list = [cache[key] for key in used_keys]
+    results.sort(reverse=True, key=key_func)
+    return results
 
-def ga_evaluate(
-    cache: dict,
-    evaluate_func: callable,
-    key_func: callable,
-    parameters: list
-) -> float:
+
+def load_result_cache(cache_path: Optional[Path]) -> Dict[Tuple, Tuple]:
     """
-    Functions to be run in genetic algorithm optimization.
+    Load optimization result cache from pickle file.
     """
-    tp: tuple = tuple(parameters)
-    if tp in cache:
-        result: tuple = cache[tp]
-    else:
-        setting: dict = dict(parameters)
-        result: dict = evaluate_func(setting)
-        cache[tp] = result
+    if not cache_path or not Path(cache_path).exists():
+        return {}
+
+    with open(cache_path, "rb") as f:
+        cache: Dict[Tuple, Tuple] = pickle.load(f)
+    return cache
+
+
+def save_result_cache(cache_path: Optional[Path], cache: Dict[Tuple, Tuple]) -> None:
+    """
+    Save optimization result cache into pickle file.
+    """
+    if not cache_path:
+        return
 
-    value: float = key_func(result)
-    return (value, )
+    with open(cache_path, "wb") as f:
+        pickle.dump(cache, f)
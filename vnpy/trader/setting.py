@@ -35,7 +35,8 @@ SETTINGS: Dict[str, Any] = {
     "database.host": "",
     "database.port": 0,
     "database.user": "",
-    "database.password": ""
+    "database.password": "",
+    "database.tick_archive": False
 }
 
 
@@ -12,6 +12,8 @@ from tzlocal import get_localzone_name
 
 import importlib_metadata
 
+from vnpy.event import EventConflator
+
 from .qt import QtCore, QtGui, QtWidgets
 from ..constant import Direction, Exchange, Offset, OrderType
 from ..engine import MainEngine, Event, EventEngine
@@ -221,6 +223,7 @@ class BaseMonitor(QtWidgets.QTableWidget):
     event_type: str = ""
     data_key: str = ""
     sorting: bool = False
+    conflated: bool = False
     headers: dict = {}
 
     signal: QtCore.Signal = QtCore.Signal(Event)
@@ -274,10 +277,32 @@ class BaseMonitor(QtWidgets.QTableWidget):
         """
         Register event handler into event engine.
         """
-        if self.event_type:
+        if not self.event_type:
+            return
+
+        # Only update latest data of each key when events come too fast
+        if self.conflated:
+            self.conflator: EventConflator = EventConflator()
+            self.signal.connect(self.process_conflated_event)
+            self.event_engine.register(self.event_type, self.put_conflated_event)
+        else:
             self.signal.connect(self.process_event)
             self.event_engine.register(self.event_type, self.signal.emit)
 
+    def put_conflated_event(self, event: Event) -> None:
+        """
+        Put event into conflator, and notify UI thread if not notified yet.
+        """
+        if self.conflator.put(event):
+            self.signal.emit(event)
+
+    def process_conflated_event(self, event: Event) -> None:
+        """
+        Process all pending events in conflator.
+        """
+        for pending_event in self.conflator.get_all():
+            self.process_event(pending_event)
+
     def process_event(self, event: Event) -> None:
         """
         Process new data from event and update into table.
@@ -399,6 +424,7 @@ class TickMonitor(BaseMonitor):
     event_type: str = EVENT_TICK
     data_key: str = "vt_symbol"
     sorting: bool = True
+    conflated: bool = True
 
     headers: dict = {
         "symbol": {"display": _("代码"), "cell": BaseCell, "update": False},
@@ -5,9 +5,11 @@ General utility functions.
 import json
 import logging
 import sys
+from functools import wraps
+from inspect import Signature, signature
 from datetime import datetime, time
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union, Optional
+from typing import Any, Callable, Dict, Tuple, Union, Optional
 from decimal import Decimal
 from math import floor, ceil
 
@@ -15,6 +17,16 @@ import numpy as np
 import talib
 
 from .object import BarData, TickData
+from .indicator import (
+    StreamIndicator,
+    SmaIndicator,
+    EmaIndicator,
+    StdIndicator,
+    AtrIndicator,
+    RsiIndicator,
+    MaxIndicator,
+    MinIndicator
+)
 from .constant import Exchange, Interval
 from .locale import _
 
@@ -484,6 +496,42 @@ class BarGenerator:
         return bar
 
 
+def cache_indicator(func: Callable) -> Callable:
+    """
+    Cache indicator result of ArrayManager until next bar is updated.
+    Only works when cache of ArrayManager is enabled.
+    """
+    name: str = func.__name__
+
+    # Arguments are bound with defaults applied, so that sma(20),
+    # sma(n=20) and sma(20, False) share the same cache key
+    func_signature: Signature = signature(func)
+    param_count: int = len(func_signature.parameters) - 1
+
+    @wraps(func)
+    def wrapper(self: "ArrayManager", *args, **kwargs) -> Any:
+        if not self.cache:
+            return func(self, *args, **kwargs)
+
+        if not kwargs and len(args) == param_count:
+            key: tuple = (name, args)
+        else:
+            bound = func_signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple(bound.arguments.values())[1:])
+
+        if key in self._cache:
+            self.cache_hits += 1
+            return self._cache[key]
+
+        self.cache_misses += 1
+        result: Any = func(self, *args, **kwargs)
+        self._cache[key] = result
+        return result
+
+    return wrapper
+
+
 class ArrayManager(object):
     """
     For:
@@ -491,11 +539,31 @@ class ArrayManager(object):
     2. calculating technical indicator value
     """
 
-    def __init__(self, size: int = 100) -> None:
-        """Constructor"""
+    def __init__(
+        self,
+        size: int = 100,
+        ring: bool = False,
+        incremental: bool = False,
+        cache: bool = False
+    ) -> None:
+        """
+        If ring is True, bar data is stored in a circular buffer so that
+        update_bar is O(1) instead of shifting the whole window.
+
+        If incremental is True, sma/ema/std/atr/rsi/donchian (and boll/keltner
+        based on them) are calculated by streaming indicators updated in
+        O(1) per bar, when called with array=False.
+
+        If cache is True, indicator results are memoized by name and
+        parameters until next bar is updated. Cached arrays are shared
+        between callers and should not be modified in place.
+        """
         self.count: int = 0
         self.size: int = size
         self.inited: bool = False
+        self.ring: bool = ring
+        self.incremental: bool = incremental
+        self.cache: bool = cache
 
         self.open_array: np.ndarray = np.zeros(size)
         self.high_array: np.ndarray = np.zeros(size)
@@ -505,6 +573,21 @@ class ArrayManager(object):
         self.turnover_array: np.ndarray = np.zeros(size)
         self.open_interest_array: np.ndarray = np.zeros(size)
 
+        # Every value is written twice (at pos and pos + size), so the
+        # latest window is always the contiguous slice [pos, pos + size).
+        self._buffer: np.ndarray = None
+        self._pos: int = 0
+
+        if ring:
+            self._buffer = np.zeros((7, size * 2))
+            self._update_view()
+
+        self._indicators: Dict[Tuple[type, int], StreamIndicator] = {}
+
+        self._cache: Dict[tuple, Any] = {}
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
     def update_bar(self, bar: BarData) -> None:
         """
         Update new bar data into array manager.
@@ -513,6 +596,17 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
+        if self._cache:
+            self._cache.clear()
+
+        if self._indicators:
+            for indicator in self._indicators.values():
+                indicator.update(bar.high_price, bar.low_price, bar.close_price)
+
+        if self.ring:
+            self._update_ring(bar)
+            return
+
         self.open_array[:-1] = self.open_array[1:]
         self.high_array[:-1] = self.high_array[1:]
         self.low_array[:-1] = self.low_array[1:]
@@ -529,6 +623,58 @@ class ArrayManager(object):
         self.turnover_array[-1] = bar.turnover
         self.open_interest_array[-1] = bar.open_interest
 
+    def _update_ring(self, bar: BarData) -> None:
+        """
+        Write new bar data into circular buffer.
+        """
+        pos: int = self._pos
+        buffer: np.ndarray = self._buffer
+
+        buffer[:, pos] = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume,
+            bar.turnover,
+            bar.open_interest
+        )
+        buffer[:, pos + self.size] = buffer[:, pos]
+
+        self._pos = (pos + 1) % self.size
+        self._update_view()
+
+    def _update_view(self) -> None:
+        """
+        Point time series arrays to the latest window of circular buffer.
+
+        The arrays are views into the buffer, no data is copied.
+        """
+        (
+            self.open_array,
+            self.high_array,
+            self.low_array,
+            self.close_array,
+            self.volume_array,
+            self.turnover_array,
+            self.open_interest_array
+        ) = self._buffer[:, self._pos:self._pos + self.size]
+
+    def _get_indicator(self, indicator_class: type, n: int) -> StreamIndicator:
+        """
+        Get streaming indicator, which is loaded with current time series
+        when first used.
+        """
+        key: Tuple[type, int] = (indicator_class, n)
+
+        indicator: Optional[StreamIndicator] = self._indicators.get(key, None)
+        if not indicator:
+            indicator = indicator_class(n)
+            indicator.load(self.high, self.low, self.close)
+            self._indicators[key] = indicator
+
+        return indicator
+
     @property
     def open(self) -> np.ndarray:
         """
@@ -578,24 +724,33 @@ class ArrayManager(object):
         """
         return self.open_interest_array
 
+    @cache_indicator
     def sma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Simple moving average.
         """
+        if self.incremental and not array:
+            return self._get_indicator(SmaIndicator, n).value
+
         result: np.ndarray = talib.SMA(self.close, n)
         if array:
             return result
         return result[-1]
 
+    @cache_indicator
     def ema(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Exponential moving average.
         """
+        if self.incremental and not array:
+            return self._get_indicator(EmaIndicator, n).value
+
         result: np.ndarray = talib.EMA(self.close, n)
         if array:
             return result
         return result[-1]
 
+    @cache_indicator
     def kama(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         KAMA.
@@ -605,6 +760,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def wma(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WMA.
@@ -614,6 +770,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def apo(
         self,
         fast_period: int,
@@ -629,6 +786,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cmo(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         CMO.
@@ -638,6 +796,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mom(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MOM.
@@ -647,6 +806,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ppo(
         self,
         fast_period: int,
@@ -662,6 +822,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def roc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROC.
@@ -671,6 +832,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR.
@@ -680,6 +842,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocp(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCP.
@@ -689,6 +852,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rocr_100(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ROCR100.
@@ -698,6 +862,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trix(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRIX.
@@ -707,15 +872,20 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def std(self, n: int, nbdev: int = 1, array: bool = False) -> Union[float, np.ndarray]:
         """
         Standard deviation.
         """
+        if self.incremental and not array:
+            return self._get_indicator(StdIndicator, n).value * nbdev
+
         result: np.ndarray = talib.STDDEV(self.close, n, nbdev)
         if array:
             return result
         return result[-1]
 
+    @cache_indicator
     def obv(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         OBV.
@@ -725,6 +895,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cci(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Commodity Channel Index (CCI).
@@ -734,15 +905,20 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def atr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Average True Range (ATR).
         """
+        if self.incremental and not array:
+            return self._get_indicator(AtrIndicator, n).value
+
         result: np.ndarray = talib.ATR(self.high, self.low, self.close, n)
         if array:
             return result
         return result[-1]
 
+    @cache_indicator
     def natr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         NATR.
@@ -752,15 +928,20 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rsi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Relative Strenght Index (RSI).
         """
+        if self.incremental and not array:
+            return self._get_indicator(RsiIndicator, n).value
+
         result: np.ndarray = talib.RSI(self.close, n)
         if array:
             return result
         return result[-1]
 
+    @cache_indicator
     def macd(
         self,
         fast_period: int,
@@ -781,6 +962,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @cache_indicator
     def adx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADX.
@@ -790,6 +972,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adxr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         ADXR.
@@ -799,6 +982,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def dx(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         DX.
@@ -808,6 +992,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DI.
@@ -817,6 +1002,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_di(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DI.
@@ -826,6 +1012,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def willr(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         WILLR.
@@ -835,6 +1022,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ultosc(
         self,
         time_period1: int = 7,
@@ -850,6 +1038,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def trange(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         TRANGE.
@@ -859,6 +1048,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def boll(
         self,
         n: int,
@@ -879,6 +1069,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def keltner(
         self,
         n: int,
@@ -899,6 +1090,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def donchian(
         self, n: int, array: bool = False
     ) -> Union[
@@ -908,6 +1100,11 @@ class ArrayManager(object):
         """
         Donchian Channel.
         """
+        if self.incremental and not array:
+            up: float = self._get_indicator(MaxIndicator, n).value
+            down: float = self._get_indicator(MinIndicator, n).value
+            return up, down
+
         up: np.ndarray = talib.MAX(self.high, n)
         down: np.ndarray = talib.MIN(self.low, n)
 
@@ -915,6 +1112,7 @@ class ArrayManager(object):
             return up, down
         return up[-1], down[-1]
 
+    @cache_indicator
     def aroon(
         self,
         n: int,
@@ -932,6 +1130,7 @@ class ArrayManager(object):
             return aroon_up, aroon_down
         return aroon_up[-1], aroon_down[-1]
 
+    @cache_indicator
     def aroonosc(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Aroon Oscillator.
@@ -942,6 +1141,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def minus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         MINUS_DM.
@@ -952,6 +1152,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def plus_dm(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         PLUS_DM.
@@ -962,6 +1163,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def mfi(self, n: int, array: bool = False) -> Union[float, np.ndarray]:
         """
         Money Flow Index.
@@ -971,6 +1173,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ad(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         AD.
@@ -980,6 +1183,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def adosc(
         self,
         fast_period: int,
@@ -994,6 +1198,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def bop(self, array: bool = False) -> Union[float, np.ndarray]:
         """
         BOP.
@@ -1004,6 +1209,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def stoch(
         self,
         fastk_period: int,
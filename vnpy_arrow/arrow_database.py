@@ -0,0 +1,419 @@
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.utility import get_folder_path, load_json, save_json
+from vnpy.trader.history import BAR_FIELDS, TICK_FIELDS
+from vnpy.trader.database import (
+    BaseDatabase,
+    BarOverview,
+    DB_TZ,
+    TickOverview,
+    convert_tz
+)
+
+
+# 数据文件目录，K线按合约、周期和月份分区，Tick按合约和日期分区
+FOLDER_NAME: str = "arrow_database"
+OVERVIEW_FILENAME: str = f"{FOLDER_NAME}/overview.json"
+FILE_SUFFIX: str = ".arrow"
+
+BAR_SCHEMA: pa.Schema = pa.schema(
+    [("datetime", pa.timestamp("us"))]
+    + [(name, pa.float64()) for name in BAR_FIELDS]
+)
+
+TICK_SCHEMA: pa.Schema = pa.schema(
+    [("datetime", pa.timestamp("us")), ("name", pa.string())]
+    + [(name, pa.float64()) for name in TICK_FIELDS]
+    + [("localtime", pa.timestamp("us"))]
+)
+
+
+class ArrowDatabase(BaseDatabase):
+    """Arrow列式文件数据库接口"""
+
+    def __init__(self) -> None:
+        """"""
+        self.root: Path = get_folder_path(FOLDER_NAME)
+        self.bar_path: Path = self.root.joinpath("bar")
+        self.tick_path: Path = self.root.joinpath("tick")
+
+        # 汇总数据全部缓存在内存中，修改后写入json文件
+        data: dict = load_json(OVERVIEW_FILENAME)
+        self.bar_overviews: Dict[str, dict] = data.get("bar", {})
+        self.tick_overviews: Dict[str, dict] = data.get("tick", {})
+
+    def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
+        """保存K线数据"""
+        # 读取主键参数
+        bar: BarData = bars[0]
+        symbol: str = bar.symbol
+        exchange: Exchange = bar.exchange
+        interval: Interval = bar.interval
+
+        # 将BarData数据转换为Arrow表
+        dt: np.ndarray = np.array([convert_tz(bar.datetime) for bar in bars], dtype="datetime64[us]")
+
+        columns: list = [dt]
+        for name in BAR_FIELDS:
+            columns.append(np.array([getattr(bar, name) for bar in bars], dtype=float))
+
+        table: pa.Table = pa.Table.from_arrays(columns, schema=BAR_SCHEMA)
+
+        # 按月份写入分区文件
+        folder: Path = self.get_bar_folder(symbol, exchange, interval)
+        count, written = write_partitions(folder, table, dt.astype("datetime64[M]"), "%Y%m")
+
+        # 根据写入成功的数据更新K线汇总数据
+        if written.any():
+            key: str = f"{symbol}.{exchange.value}.{interval.value}"
+            update_overview(self.bar_overviews, key, count, dt[written])
+            self.save_overview()
+
+        return bool(written.all())
+
+    def save_tick_data(self, ticks: List[TickData], stream: bool = False) -> bool:
+        """保存TICK数据"""
+        # 读取主键参数
+        tick: TickData = ticks[0]
+        symbol: str = tick.symbol
+        exchange: Exchange = tick.exchange
+
+        # 将TickData数据转换为Arrow表
+        dt: np.ndarray = np.array([convert_tz(tick.datetime) for tick in ticks], dtype="datetime64[us]")
+
+        columns: list = [dt, pa.array([tick.name for tick in ticks], pa.string())]
+        for name in TICK_FIELDS:
+            columns.append(np.array([getattr(tick, name) for tick in ticks], dtype=float))
+        columns.append(pa.array(
+            [to_db_time(tick.localtime) if tick.localtime else None for tick in ticks],
+            pa.timestamp("us")
+        ))
+
+        table: pa.Table = pa.Table.from_arrays(columns, schema=TICK_SCHEMA)
+
+        # 按日期写入分区文件
+        folder: Path = self.get_tick_folder(symbol, exchange)
+        count, written = write_partitions(folder, table, dt.astype("datetime64[D]"), "%Y%m%d")
+
+        # 根据写入成功的数据更新Tick汇总数据
+        if written.any():
+            key: str = f"{symbol}.{exchange.value}"
+            update_overview(self.tick_overviews, key, count, dt[written])
+            self.save_overview()
+
+        return bool(written.all())
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[BarData]:
+        """读取K线数据"""
+        return self.load_bar_history(symbol, exchange, interval, start, end).to_bars()
+
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> List[TickData]:
+        """读取TICK数据"""
+        folder: Path = self.get_tick_folder(symbol, exchange)
+        table: pa.Table = read_partitions(folder, TICK_SCHEMA, start, end, "%Y%m%d")
+
+        data: Dict[str, list] = table.to_pydict()
+        names: List[str] = ["name"] + TICK_FIELDS
+
+        ticks: List[TickData] = []
+        for dt, localtime, *values in zip(data["datetime"], data["localtime"], *[data[n] for n in names]):
+            tick: TickData = TickData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt.replace(tzinfo=DB_TZ),
+                localtime=localtime,
+                gateway_name="DB",
+                **dict(zip(names, values))
+            )
+            ticks.append(tick)
+
+        return ticks
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """读取K线数据，单个分区内的数组直接引用内存映射文件"""
+        folder: Path = self.get_bar_folder(symbol, exchange, interval)
+        table: pa.Table = read_partitions(folder, BAR_SCHEMA, start, end, "%Y%m")
+        return to_arrays(table, BAR_FIELDS)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """读取Tick数据，单个分区内的数组直接引用内存映射文件"""
+        folder: Path = self.get_tick_folder(symbol, exchange)
+        table: pa.Table = read_partitions(folder, TICK_SCHEMA, start, end, "%Y%m%d")
+        return to_arrays(table, TICK_FIELDS)
+
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> int:
+        """删除K线数据"""
+        folder: Path = self.get_bar_folder(symbol, exchange, interval)
+        if folder.exists():
+            shutil.rmtree(folder)
+
+        key: str = f"{symbol}.{exchange.value}.{interval.value}"
+        overview: dict = self.bar_overviews.pop(key, {})
+        self.save_overview()
+
+        return overview.get("count", 0)
+
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange
+    ) -> int:
+        """删除TICK数据"""
+        folder: Path = self.get_tick_folder(symbol, exchange)
+        if folder.exists():
+            shutil.rmtree(folder)
+
+        key: str = f"{symbol}.{exchange.value}"
+        overview: dict = self.tick_overviews.pop(key, {})
+        self.save_overview()
+
+        return overview.get("count", 0)
+
+    def get_bar_overview(self) -> List[BarOverview]:
+        """查询数据库中的K线汇总信息"""
+        overviews: List[BarOverview] = []
+
+        for key, d in self.bar_overviews.items():
+            symbol, exchange, interval = key.rsplit(".", 2)
+
+            overview: BarOverview = BarOverview(
+                symbol=symbol,
+                exchange=Exchange(exchange),
+                interval=Interval(interval),
+                count=d["count"],
+                start=datetime.fromisoformat(d["start"]),
+                end=datetime.fromisoformat(d["end"])
+            )
+            overviews.append(overview)
+
+        return overviews
+
+    def get_tick_overview(self) -> List[TickOverview]:
+        """查询数据库中的Tick汇总信息"""
+        overviews: List[TickOverview] = []
+
+        for key, d in self.tick_overviews.items():
+            symbol, exchange = key.rsplit(".", 1)
+
+            overview: TickOverview = TickOverview(
+                symbol=symbol,
+                exchange=Exchange(exchange),
+                count=d["count"],
+                start=datetime.fromisoformat(d["start"]),
+                end=datetime.fromisoformat(d["end"])
+            )
+            overviews.append(overview)
+
+        return overviews
+
+    def get_bar_folder(self, symbol: str, exchange: Exchange, interval: Interval) -> Path:
+        """获取K线数据分区目录"""
+        return self.bar_path.joinpath(f"{symbol}.{exchange.value}", interval.value)
+
+    def get_tick_folder(self, symbol: str, exchange: Exchange) -> Path:
+        """获取Tick数据分区目录"""
+        return self.tick_path.joinpath(f"{symbol}.{exchange.value}")
+
+    def save_overview(self) -> None:
+        """保存汇总数据到文件"""
+        save_json(OVERVIEW_FILENAME, {"bar": self.bar_overviews, "tick": self.tick_overviews})
+
+
+def write_partitions(folder: Path, table: pa.Table, partitions: np.ndarray, fmt: str) -> Tuple[int, np.ndarray]:
+    """按分区写入数据，返回新增的数据量和每行数据是否写入成功"""
+    folder.mkdir(parents=True, exist_ok=True)
+
+    count: int = 0
+    written: np.ndarray = np.zeros(len(partitions), dtype=bool)
+
+    for partition in np.unique(partitions):
+        name: str = partition.astype(datetime).strftime(fmt)
+        path: Path = folder.joinpath(name + FILE_SUFFIX)
+
+        indices: np.ndarray = np.flatnonzero(partitions == partition)
+        new: pa.Table = table.take(indices)
+
+        # 读取已有分区，合并后重写整个分区文件
+        if path.exists():
+            with pa.OSFile(str(path)) as f:
+                old: pa.Table = pa.ipc.open_file(f).read_all()
+        else:
+            old = new.schema.empty_table()
+
+        merged: pa.Table = merge_table(old, new)
+
+        # 先写入临时文件再替换，避免写入中断损坏数据
+        temp_path: Path = path.with_suffix(".tmp")
+        with pa.OSFile(str(temp_path), "wb") as f:
+            with pa.ipc.new_file(f, merged.schema) as writer:
+                writer.write_table(merged)
+
+        # Windows上分区文件仍被内存映射读取的数据引用时无法替换，跳过该分区
+        try:
+            os.replace(temp_path, path)
+        except PermissionError:
+            temp_path.unlink()
+            continue
+
+        count += len(merged) - len(old)
+        written[indices] = True
+
+    return count, written
+
+
+def merge_table(old: pa.Table, new: pa.Table) -> pa.Table:
+    """合并数据并按时间排序，时间重复的数据使用新数据"""
+    old_dt: np.ndarray = get_datetime(old)
+    new_dt: np.ndarray = get_datetime(new)
+
+    # 新数据全部在已有数据之后，直接追加
+    new_sorted: bool = bool(np.all(new_dt[1:] > new_dt[:-1]))
+    if new_sorted and (not len(old_dt) or new_dt[0] > old_dt[-1]):
+        return pa.concat_tables([old, new]).combine_chunks()
+
+    table: pa.Table = pa.concat_tables([old, new])
+    dt: np.ndarray = np.concatenate([old_dt, new_dt])
+
+    # 稳定排序后保留每个时间的最后一条数据
+    order: np.ndarray = np.argsort(dt, kind="stable")
+    sorted_dt: np.ndarray = dt[order]
+
+    last: np.ndarray = np.ones(len(sorted_dt), dtype=bool)
+    last[:-1] = sorted_dt[1:] != sorted_dt[:-1]
+
+    return table.take(order[last]).combine_chunks()
+
+
+def read_partitions(
+    folder: Path,
+    schema: pa.Schema,
+    start: datetime,
+    end: datetime,
+    fmt: str
+) -> pa.Table:
+    """读取时间范围内的分区数据，历史分区文件使用内存映射读取"""
+    start_dt: np.datetime64 = np.datetime64(to_db_time(start), "us")
+    end_dt: np.datetime64 = np.datetime64(to_db_time(end), "us")
+
+    start_name: str = to_db_time(start).strftime(fmt)
+    end_name: str = to_db_time(end).strftime(fmt)
+
+    tables: List[pa.Table] = []
+
+    if folder.exists():
+        paths: List[Path] = sorted(folder.glob("*" + FILE_SUFFIX))
+
+        for path in paths:
+            # 根据分区名称跳过范围外的文件
+            if not start_name <= path.stem <= end_name:
+                continue
+
+            # 最新分区会被追加数据重写，读取到内存中避免文件保持映射无法替换
+            if path == paths[-1]:
+                with pa.OSFile(str(path)) as f:
+                    table: pa.Table = pa.ipc.open_file(f).read_all()
+            else:
+                table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+            # 分区内数据按时间排序，二分查找范围
+            dt: np.ndarray = get_datetime(table)
+            left: int = int(np.searchsorted(dt, start_dt, "left"))
+            right: int = int(np.searchsorted(dt, end_dt, "right"))
+
+            if right > left:
+                tables.append(table.slice(left, right - left))
+
+    if not tables:
+        return schema.empty_table()
+    elif len(tables) == 1:
+        return tables[0]
+    else:
+        return pa.concat_tables(tables).combine_chunks()
+
+
+def get_datetime(table: pa.Table) -> np.ndarray:
+    """获取表中的时间数组"""
+    column: pa.ChunkedArray = table.column("datetime")
+
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy()
+    else:
+        return column.to_numpy()
+
+
+def to_arrays(table: pa.Table, names: List[str]) -> Dict[str, np.ndarray]:
+    """将表转换为numpy数组，单个数据块且无空值时不复制数据"""
+    arrays: Dict[str, np.ndarray] = {"datetime": get_datetime(table)}
+
+    for name in names:
+        column: pa.ChunkedArray = table.column(name)
+        if column.num_chunks == 1 and not column.null_count:
+            arrays[name] = column.chunk(0).to_numpy()
+        else:
+            arrays[name] = column.to_numpy().astype(float)
+
+    return arrays
+
+
+def to_db_time(dt: datetime) -> datetime:
+    """转换为数据库时区的时间，不带时区信息的时间视为数据库时区"""
+    if dt.tzinfo:
+        return convert_tz(dt)
+    return dt
+
+
+def update_overview(overviews: Dict[str, dict], key: str, count: int, dt: np.ndarray) -> None:
+    """更新汇总数据"""
+    start: datetime = dt.min().astype(datetime)
+    end: datetime = dt.max().astype(datetime)
+
+    overview: Optional[dict] = overviews.get(key, None)
+
+    if not overview:
+        overview = {"count": 0, "start": start.isoformat(), "end": end.isoformat()}
+        overviews[key] = overview
+    else:
+        overview["start"] = min(start, datetime.fromisoformat(overview["start"])).isoformat()
+        overview["end"] = max(end, datetime.fromisoformat(overview["end"])).isoformat()
+
+    overview["count"] += count
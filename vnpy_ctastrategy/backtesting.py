@@ -1,8 +1,12 @@
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
-from typing import Callable, List, Dict, Optional, Type
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, Type
 from functools import lru_cache, partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
 import traceback
+import hashlib
 
 import numpy as np
 from pandas import DataFrame, Series
@@ -19,11 +23,16 @@ from vnpy.trader.constant import (
 )
 from vnpy.trader.database import get_database, BaseDatabase
 from vnpy.trader.object import OrderData, TradeData, BarData, TickData
-from vnpy.trader.utility import round_to, extract_vt_symbol
+from vnpy.trader.history import BarHistory, TickHistory
+from vnpy.trader.archive import TickArchive, get_tick_archive
+from vnpy.trader.setting import SETTINGS
+from vnpy.trader.utility import round_to, extract_vt_symbol, get_folder_path
 from vnpy.trader.optimize import (
     OptimizationSetting,
+    OptimizationPool,
     check_optimization_setting,
     run_bf_optimization,
+    run_sh_optimization,
     run_ga_optimization
 )
 
@@ -61,6 +70,7 @@ class BacktestingEngine:
         self.annual_days: int = 240
         self.half_life: int = 120
         self.mode: BacktestingMode = BacktestingMode.BAR
+        self.vectorized: bool = False
 
         self.strategy_class: Type[CtaTemplate] = None
         self.strategy: CtaTemplate = None
@@ -72,6 +82,7 @@ class BacktestingEngine:
         self.days: int = 0
         self.callback: Callable = None
         self.history_data: list = []
+        self.init_data: List[BarData] = []
 
         self.stop_order_count: int = 0
         self.stop_orders: Dict[str, StopOrder] = {}
@@ -89,6 +100,10 @@ class BacktestingEngine:
         self.daily_results: Dict[date, DailyResult] = {}
         self.daily_df: DataFrame = None
 
+        self.optimization_pool: OptimizationPool = None
+        self.pool_history_dir: TemporaryDirectory = None
+        self.pool_history_key: tuple = None
+
     def clear_data(self) -> None:
         """
         Clear all data of last backtesting.
@@ -97,6 +112,7 @@ class BacktestingEngine:
         self.tick = None
         self.bar = None
         self.datetime = None
+        self.init_data = []
 
         self.stop_order_count = 0
         self.stop_orders.clear()
@@ -126,7 +142,8 @@ class BacktestingEngine:
         mode: BacktestingMode = BacktestingMode.BAR,
         risk_free: float = 0,
         annual_days: int = 240,
-        half_life: int = 120
+        half_life: int = 120,
+        vectorized: bool = False
     ) -> None:
         """"""
         self.mode = mode
@@ -151,6 +168,7 @@ class BacktestingEngine:
         self.risk_free = risk_free
         self.annual_days = annual_days
         self.half_life = half_life
+        self.vectorized = vectorized
 
     def add_strategy(self, strategy_class: Type[CtaTemplate], setting: dict) -> None:
         """"""
@@ -170,7 +188,20 @@ class BacktestingEngine:
             self.output(_("起始日期必须小于结束日期"))
             return
 
-        self.history_data.clear()       # Clear previously loaded history data
+        self.history_data = []          # Clear previously loaded history data
+        histories: List[BarHistory] = []
+
+        # Replay ticks from memory-mapped archive if the whole range archived
+        use_archive: bool = self.mode == BacktestingMode.TICK and SETTINGS["database.tick_archive"]
+        if use_archive and get_tick_archive().check_range(self.symbol, self.exchange, self.start, self.end):
+            self.history_data = load_tick_history(
+                self.symbol,
+                self.exchange,
+                self.start,
+                self.end
+            )
+            self.output(_("历史数据加载完成，数据量：{}").format(len(self.history_data)))
+            return
 
         # Load 30 days of data each time and allow for progress update
         total_days: int = (self.end - self.start).days
@@ -189,13 +220,14 @@ class BacktestingEngine:
             end: datetime = min(end, self.end)  # Make sure end time stays within set range
 
             if self.mode == BacktestingMode.BAR:
-                data: List[BarData] = load_bar_data(
+                history: BarHistory = load_bar_history(
                     self.symbol,
                     self.exchange,
                     self.interval,
                     start,
                     end
                 )
+                histories.append(history)
             else:
                 data: List[TickData] = load_tick_data(
                     self.symbol,
@@ -203,8 +235,7 @@ class BacktestingEngine:
                     start,
                     end
                 )
-
-            self.history_data.extend(data)
+                self.history_data.extend(data)
 
             progress += progress_days / total_days
             progress = min(progress, 1)
@@ -212,6 +243,16 @@ class BacktestingEngine:
             start = end + interval_delta
             end += progress_delta
 
+        # Bar data is kept in columnar container to reduce memory usage
+        if histories:
+            self.history_data = BarHistory.concatenate(histories)
+
+        # Archive ticks loaded from database for next time
+        if use_archive and self.history_data:
+            archive: TickArchive = get_tick_archive()
+            archive.save_tick_data(self.history_data)
+            archive.add_range(self.symbol, self.exchange, self.start, self.end)
+
         self.output(_("历史数据加载完成，数据量：{}").format(len(self.history_data)))
 
     def run_backtesting(self) -> None:
@@ -229,6 +270,14 @@ class BacktestingEngine:
         self.strategy.trading = True
         self.output(_("开始回放历史数据"))
 
+        if self.vectorized and self.mode == BacktestingMode.BAR:
+            if self.run_vectorized():
+                self.strategy.on_stop()
+                self.output(_("历史数据回放结束"))
+                return
+
+            self.output(_("策略未实现向量化信号，使用逐K线回放"))
+
         total_size: int = len(self.history_data)
         batch_size: int = max(int(total_size / 10), 1)
 
@@ -249,6 +298,167 @@ class BacktestingEngine:
         self.strategy.on_stop()
         self.output(_("历史数据回放结束"))
 
+    def run_vectorized(self) -> bool:
+        """
+        Replay bar data with whole-array signal generated by strategy.
+
+        Strategy returns target position (nan for no order) and order price
+        of every bar. Same as event-driven mode, order sent on one bar is
+        matched with the next bar and cancelled if not traded. Only bars
+        where target differs from current position are visited, so the cost
+        is proportional to number of orders instead of bars.
+
+        Return False if strategy does not support vectorized signal.
+        """
+        if isinstance(self.history_data, BarHistory):
+            history_data: BarHistory = self.history_data
+        else:
+            history_data: BarHistory = BarHistory.from_bars(self.history_data)
+
+        if not history_data:
+            return True
+
+        init_data: BarHistory = BarHistory.from_bars(
+            self.init_data,
+            self.symbol,
+            self.exchange,
+            self.interval
+        )
+        bars: BarHistory = BarHistory.concatenate([init_data, history_data])
+
+        data: Dict[str, np.ndarray] = {
+            "open": bars.data["open_price"],
+            "high": bars.data["high_price"],
+            "low": bars.data["low_price"],
+            "close": bars.data["close_price"],
+            "volume": bars.data["volume"],
+            "turnover": bars.data["turnover"],
+            "open_interest": bars.data["open_interest"],
+        }
+
+        signal: Optional[Tuple[np.ndarray, np.ndarray]] = self.strategy.generate_signal(data)
+        if signal is None:
+            return False
+
+        target: np.ndarray = np.array(signal[0], dtype=float)
+        price: np.ndarray = np.asarray(signal[1], dtype=float)
+
+        # No order can be sent when strategy is initializing
+        init_size: int = len(self.init_data)
+        target[:init_size] = np.nan
+        valid: np.ndarray = ~np.isnan(target)
+
+        open_array: np.ndarray = data["open"]
+        high_array: np.ndarray = data["high"]
+        low_array: np.ndarray = data["low"]
+        last_ix: int = len(bars) - 1
+
+        # Bar indexes of orders which change position from a given value
+        order_indexes: Dict[float, np.ndarray] = {}
+
+        pos: float = 0
+        ix: int = init_size
+
+        while True:
+            indexes: Optional[np.ndarray] = order_indexes.get(pos, None)
+            if indexes is None:
+                indexes = np.flatnonzero(valid & (target != pos))
+                order_indexes[pos] = indexes
+
+            n: int = np.searchsorted(indexes, ix)
+            if n == len(indexes):
+                break
+
+            i: int = int(indexes[n])
+            if i >= last_ix:
+                break
+            ix = i + 1
+
+            new_pos: float = float(target[i])
+            order_price: float = round_to(price[i], self.pricetick)
+
+            if new_pos > pos:
+                cross_price: float = low_array[ix]
+                if order_price < cross_price or cross_price <= 0:
+                    continue
+                trade_price: float = min(order_price, open_array[ix])
+                direction: Direction = Direction.LONG
+            else:
+                cross_price: float = high_array[ix]
+                if order_price > cross_price or cross_price <= 0:
+                    continue
+                trade_price: float = max(order_price, open_array[ix])
+                direction: Direction = Direction.SHORT
+
+            self.datetime = bars[ix].datetime
+
+            # Reverse position with a close trade and an open trade
+            if pos * new_pos < 0:
+                self.create_vectorized_trade(direction, Offset.CLOSE, trade_price, abs(pos))
+                self.create_vectorized_trade(direction, Offset.OPEN, trade_price, abs(new_pos))
+            elif abs(new_pos) > abs(pos):
+                self.create_vectorized_trade(direction, Offset.OPEN, trade_price, abs(new_pos - pos))
+            else:
+                self.create_vectorized_trade(direction, Offset.CLOSE, trade_price, abs(new_pos - pos))
+
+            pos = new_pos
+
+        self.strategy.pos = pos
+
+        # Close price of daily result is from the last bar of each day
+        days: np.ndarray = history_data.datetime.astype("datetime64[D]")
+        day_ends: np.ndarray = np.append(np.flatnonzero(days[1:] != days[:-1]), len(days) - 1)
+        close_prices: list = history_data.data["close_price"][day_ends].tolist()
+
+        for d, close_price in zip(days[day_ends].tolist(), close_prices):
+            self.daily_results[d] = DailyResult(d, close_price)
+
+        self.datetime = bars[-1].datetime
+        return True
+
+    def create_vectorized_trade(
+        self,
+        direction: Direction,
+        offset: Offset,
+        price: float,
+        volume: float
+    ) -> None:
+        """
+        Create order and trade data of vectorized backtesting.
+        """
+        self.limit_order_count += 1
+
+        order: OrderData = OrderData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            orderid=str(self.limit_order_count),
+            direction=direction,
+            offset=offset,
+            price=price,
+            volume=volume,
+            traded=volume,
+            status=Status.ALLTRADED,
+            gateway_name=self.gateway_name,
+            datetime=self.datetime
+        )
+        self.limit_orders[order.vt_orderid] = order
+
+        self.trade_count += 1
+
+        trade: TradeData = TradeData(
+            symbol=order.symbol,
+            exchange=order.exchange,
+            orderid=order.orderid,
+            tradeid=str(self.trade_count),
+            direction=direction,
+            offset=offset,
+            price=price,
+            volume=volume,
+            datetime=self.datetime,
+            gateway_name=self.gateway_name,
+        )
+        self.trades[trade.vt_tradeid] = trade
+
     def calculate_result(self) -> DataFrame:
         """"""
         self.output(_("开始计算逐日盯市盈亏"))
@@ -262,21 +472,24 @@ class BacktestingEngine:
             daily_result: DailyResult = self.daily_results[d]
             daily_result.add_trade(trade)
 
-        # Calculate daily result by iteration.
-        pre_close = 0
-        start_pos = 0
-
-        for daily_result in self.daily_results.values():
-            daily_result.calculate_pnl(
-                pre_close,
-                start_pos,
-                self.size,
-                self.rate,
-                self.slippage
-            )
+        if self.vectorized:
+            self.calculate_vectorized_pnl()
+        else:
+            # Calculate daily result by iteration.
+            pre_close = 0
+            start_pos = 0
+
+            for daily_result in self.daily_results.values():
+                daily_result.calculate_pnl(
+                    pre_close,
+                    start_pos,
+                    self.size,
+                    self.rate,
+                    self.slippage
+                )
 
-            pre_close = daily_result.close_price
-            start_pos = daily_result.end_pos
+                pre_close = daily_result.close_price
+                start_pos = daily_result.end_pos
 
         # Generate dataframe
         results: defaultdict = defaultdict(list)
@@ -290,6 +503,65 @@ class BacktestingEngine:
         self.output(_("逐日盯市盈亏计算完成"))
         return self.daily_df
 
+    def calculate_vectorized_pnl(self) -> None:
+        """
+        Calculate pnl of all daily results in batch, same as DailyResult.
+        """
+        daily_results: List[DailyResult] = list(self.daily_results.values())
+        if not daily_results:
+            return
+
+        day_count: int = len(daily_results)
+        day_indexes: Dict[date, int] = {r.date: i for i, r in enumerate(daily_results)}
+
+        trades: List[TradeData] = list(self.trades.values())
+        trade_days: np.ndarray = np.array(
+            [day_indexes[trade.datetime.date()] for trade in trades], dtype=int
+        )
+        prices: np.ndarray = np.array([trade.price for trade in trades], dtype=float)
+        volumes: np.ndarray = np.array([trade.volume for trade in trades], dtype=float)
+        pos_changes: np.ndarray = np.array(
+            [trade.volume if trade.direction == Direction.LONG else -trade.volume for trade in trades],
+            dtype=float
+        )
+
+        close_prices: np.ndarray = np.array([r.close_price for r in daily_results], dtype=float)
+
+        # If no pre_close provided, use value 1 to avoid zero division error
+        pre_closes: np.ndarray = np.concatenate(([0], close_prices[:-1]))
+        pre_closes[pre_closes == 0] = 1
+
+        end_pos: np.ndarray = np.cumsum(np.bincount(trade_days, pos_changes, day_count))
+        start_pos: np.ndarray = np.concatenate(([0], end_pos[:-1]))
+
+        trade_turnover: np.ndarray = volumes * self.size * prices
+        turnover: np.ndarray = np.bincount(trade_days, trade_turnover, day_count)
+        commission: np.ndarray = np.bincount(trade_days, trade_turnover * self.rate, day_count)
+        slippage: np.ndarray = np.bincount(trade_days, volumes * self.size * self.slippage, day_count)
+        trade_count: np.ndarray = np.bincount(trade_days, minlength=day_count)
+
+        trading_pnl: np.ndarray = np.bincount(
+            trade_days,
+            pos_changes * (close_prices[trade_days] - prices) * self.size,
+            day_count
+        )
+        holding_pnl: np.ndarray = start_pos * (close_prices - pre_closes) * self.size
+        total_pnl: np.ndarray = trading_pnl + holding_pnl
+        net_pnl: np.ndarray = total_pnl - commission - slippage
+
+        for i, daily_result in enumerate(daily_results):
+            daily_result.pre_close = pre_closes[i]
+            daily_result.start_pos = start_pos[i]
+            daily_result.end_pos = end_pos[i]
+            daily_result.trade_count = int(trade_count[i])
+            daily_result.turnover = turnover[i]
+            daily_result.commission = commission[i]
+            daily_result.slippage = slippage[i]
+            daily_result.trading_pnl = trading_pnl[i]
+            daily_result.holding_pnl = holding_pnl[i]
+            daily_result.total_pnl = total_pnl[i]
+            daily_result.net_pnl = net_pnl[i]
+
     def calculate_statistics(self, df: DataFrame = None, output=True) -> dict:
         """"""
         self.output(_("开始计算策略统计指标"))
@@ -538,14 +810,20 @@ class BacktestingEngine:
         if not check_optimization_setting(optimization_setting):
             return
 
-        evaluate_func: callable = wrap_evaluate(self, optimization_setting.target_name)
-        results: list = run_bf_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            output=self.output
-        )
+        with self.open_history_path() as history_path:
+            evaluate_func: callable = wrap_evaluate(
+                self,
+                optimization_setting.target_name,
+                history_path
+            )
+            results: list = run_bf_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                output=self.output,
+                pool=self.optimization_pool
+            )
 
         if output:
             for result in results:
@@ -556,26 +834,42 @@ class BacktestingEngine:
 
     run_optimization = run_bf_optimization
 
-    def run_ga_optimization(
+    def run_sh_optimization(
         self,
         optimization_setting: OptimizationSetting,
         output: bool = True,
         max_workers: int = None,
-        ngen_size: int = 30
+        eta: int = 3,
+        min_fraction: float = 0.1
     ) -> list:
         """"""
         if not check_optimization_setting(optimization_setting):
             return
 
-        evaluate_func: callable = wrap_evaluate(self, optimization_setting.target_name)
-        results: list = run_ga_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            ngen_size=ngen_size,
-            output=self.output
-        )
+        if eta <= 1:
+            self.output(_("减半系数必须大于1，请检查"))
+            return
+
+        if not 0 < min_fraction <= 1:
+            self.output(_("最小历史数据比例必须在0到1之间，请检查"))
+            return
+
+        with self.open_history_path() as history_path:
+            evaluate_func: callable = wrap_evaluate(
+                self,
+                optimization_setting.target_name,
+                history_path
+            )
+            results: list = run_sh_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                eta=eta,
+                min_fraction=min_fraction,
+                output=self.output,
+                pool=self.optimization_pool
+            )
 
         if output:
             for result in results:
@@ -584,6 +878,162 @@ class BacktestingEngine:
 
         return results
 
+    def run_ga_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        output: bool = True,
+        max_workers: int = None,
+        ngen_size: int = 30,
+        persist_cache: bool = False
+    ) -> list:
+        """
+        With persist_cache enabled, evaluated results are saved into file,
+        and reused by later runs with the same backtesting parameters.
+        """
+        if not check_optimization_setting(optimization_setting):
+            return
+
+        if persist_cache:
+            cache_path: Optional[Path] = self.get_cache_path(optimization_setting.target_name)
+        else:
+            cache_path = None
+
+        with self.open_history_path() as history_path:
+            evaluate_func: callable = wrap_evaluate(
+                self,
+                optimization_setting.target_name,
+                history_path
+            )
+            results: list = run_ga_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                ngen_size=ngen_size,
+                output=self.output,
+                pool=self.optimization_pool,
+                cache_path=cache_path
+            )
+
+        if output:
+            for result in results:
+                msg: str = _("参数：{}, 目标：{}").format(result[0], result[1])
+                self.output(msg)
+
+        return results
+
+    def start_optimization_pool(
+        self,
+        max_workers: int = None,
+        memory_limit: int = 0
+    ) -> None:
+        """
+        Start a long-lived worker pool for successive optimization runs.
+
+        History data is published once and loaded by every worker when
+        started. Memory limit (MB) of each worker only works on POSIX.
+        """
+        self.stop_optimization_pool()
+
+        self.pool_history_dir = TemporaryDirectory()
+        self.pool_history_key = self.get_history_key()
+        self.publish_history_data(self.pool_history_dir.name)
+
+        self.optimization_pool = OptimizationPool(
+            max_workers,
+            initializer=init_optimization_worker,
+            initargs=(self.pool_history_dir.name, self.strategy_class),
+            memory_limit=memory_limit
+        )
+
+    def stop_optimization_pool(self) -> None:
+        """
+        Shutdown worker pool and remove published history data.
+        """
+        if self.optimization_pool:
+            self.optimization_pool.shutdown()
+            self.optimization_pool = None
+
+        if self.pool_history_dir:
+            self.pool_history_dir.cleanup()
+            self.pool_history_dir = None
+            self.pool_history_key = None
+
+    def get_history_key(self) -> tuple:
+        """
+        Key of parameters which determine loaded history data.
+        """
+        return (self.vt_symbol, self.interval, self.start, self.end, self.mode)
+
+    def get_cache_path(self, target_name: str) -> Path:
+        """
+        Path of optimization result cache file, named by strategy class and
+        digest of backtesting parameters.
+
+        Notice that cache is not invalidated when strategy code is changed.
+        """
+        key: str = repr((
+            self.vt_symbol,
+            self.interval,
+            self.start,
+            self.end,
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+            self.mode,
+            self.vectorized,
+            target_name
+        ))
+        digest: str = hashlib.md5(key.encode()).hexdigest()
+
+        folder_path: Path = get_folder_path("optimization_cache")
+        return folder_path.joinpath(f"{self.strategy_class.__name__}_{digest}.pkl")
+
+    @contextmanager
+    def open_history_path(self) -> Iterator[str]:
+        """
+        Provide path of published history data for optimization.
+
+        History published by worker pool is reused if backtesting parameters
+        not changed, otherwise the pool is restarted with history published
+        again, since workers keep the old one memory-mapped. Without worker
+        pool it is published into a temporary folder.
+        """
+        if self.optimization_pool:
+            if self.pool_history_key != self.get_history_key():
+                self.output(_("回测参数已变化，重启优化进程池"))
+                self.start_optimization_pool(
+                    self.optimization_pool.max_workers,
+                    self.optimization_pool.memory_limit
+                )
+
+            yield self.pool_history_dir.name
+            return
+
+        with TemporaryDirectory() as history_path:
+            self.publish_history_data(history_path)
+            yield history_path
+
+    def publish_history_data(self, path: str) -> None:
+        """
+        Save bar history into memory-mapped files under path, so that
+        optimization workers can share it instead of loading from database.
+        """
+        if self.mode != BacktestingMode.BAR:
+            return
+
+        if not self.history_data:
+            self.load_data()
+
+        if isinstance(self.history_data, BarHistory):
+            history_data: BarHistory = self.history_data
+        else:
+            history_data: BarHistory = BarHistory.from_bars(self.history_data)
+
+        history_data.save(path)
+
     def update_daily_close(self, price: float) -> None:
         """"""
         d: date = self.datetime.date()
@@ -801,6 +1251,10 @@ class BacktestingEngine:
             init_end
         )
 
+        # Keep bars for initializing vectorized signal
+        if interval == self.interval:
+            self.init_data = bars
+
         return bars
 
     def load_tick(self, vt_symbol: str, days: int, callback: Callable) -> List[TickData]:
@@ -1091,6 +1545,39 @@ def load_bar_data(
     )
 
 
+@lru_cache(maxsize=999)
+def load_bar_history(
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    start: datetime,
+    end: datetime
+) -> BarHistory:
+    """"""
+    database: BaseDatabase = get_database()
+
+    return database.load_bar_history(
+        symbol, exchange, interval, start, end
+    )
+
+
+@lru_cache(maxsize=999)
+def load_shared_history(path: str) -> BarHistory:
+    """
+    Memory-map bar history published by optimization parent process.
+    """
+    return BarHistory.load(path)
+
+
+def init_optimization_worker(history_path: str, strategy_class: Type[CtaTemplate]) -> None:
+    """
+    Load history data when optimization worker started, strategy class
+    is imported when unpickled as argument.
+    """
+    if Path(history_path).joinpath("data.npy").exists():
+        load_shared_history(history_path)
+
+
 @lru_cache(maxsize=999)
 def load_tick_data(
     symbol: str,
@@ -1106,6 +1593,18 @@ def load_tick_data(
     )
 
 
+def load_tick_history(
+    symbol: str,
+    exchange: Exchange,
+    start: datetime,
+    end: datetime
+) -> TickHistory:
+    """
+    Load ticks from memory-mapped archive, which is opened without parsing.
+    """
+    return get_tick_archive().load_tick_history(symbol, exchange, start, end)
+
+
 def evaluate(
     target_name: str,
     strategy_class: CtaTemplate,
@@ -1119,10 +1618,15 @@ def evaluate(
     capital: int,
     end: datetime,
     mode: BacktestingMode,
-    setting: dict
+    vectorized: bool,
+    history_path: str,
+    setting: dict,
+    fraction: float = 1
 ) -> tuple:
     """
     Function for running in multiprocessing.pool
+
+    Only the first fraction of history data is used if fraction < 1.
     """
     engine: BacktestingEngine = BacktestingEngine()
 
@@ -1136,11 +1640,21 @@ def evaluate(
         pricetick=pricetick,
         capital=capital,
         end=end,
-        mode=mode
+        mode=mode,
+        vectorized=vectorized
     )
 
     engine.add_strategy(strategy_class, setting)
-    engine.load_data()
+
+    if history_path and Path(history_path).joinpath("data.npy").exists():
+        engine.history_data = load_shared_history(history_path)
+    else:
+        engine.load_data()
+
+    if fraction < 1:
+        size: int = int(len(engine.history_data) * fraction)
+        engine.history_data = engine.history_data[:size]
+
     engine.run_backtesting()
     engine.calculate_result()
     statistics: dict = engine.calculate_statistics(output=False)
@@ -1149,7 +1663,11 @@ def evaluate(
     return (setting, target_value, statistics)
 
 
-def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> callable:
+def wrap_evaluate(
+    engine: BacktestingEngine,
+    target_name: str,
+    history_path: str = ""
+) -> callable:
     """
     Wrap evaluate function with given setting from backtesting engine.
     """
@@ -1166,7 +1684,9 @@ def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> callable:
         engine.pricetick,
         engine.capital,
         engine.end,
-        engine.mode
+        engine.mode,
+        engine.vectorized,
+        history_path
     )
     return func
 
@@ -1,3 +1,8 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import talib
+
 from vnpy_ctastrategy import (
     CtaTemplate,
     StopOrder,
@@ -100,6 +105,30 @@ class DoubleMaStrategy(CtaTemplate):
 
         self.put_event()
 
+    def generate_signal(self, data: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate signal for vectorized backtesting.
+        """
+        close = data["close"]
+
+        fast_ma = talib.SMA(close, self.fast_window)
+        slow_ma = talib.SMA(close, self.slow_window)
+
+        fast_ma1 = np.roll(fast_ma, 1)
+        slow_ma1 = np.roll(slow_ma, 1)
+
+        cross_over = (fast_ma > slow_ma) & (fast_ma1 < slow_ma1)
+        cross_below = (fast_ma < slow_ma) & (fast_ma1 > slow_ma1)
+
+        target = np.full(len(close), np.nan)
+        target[cross_over] = 1
+        target[cross_below] = -1
+
+        # No signal before array manager is inited
+        target[:self.am.size - 1] = np.nan
+
+        return target, close
+
     def on_order(self, order: OrderData):
         """
         Callback of new order data update.
@@ -1,6 +1,8 @@
 from abc import ABC
 from copy import copy
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from vnpy.trader.constant import Interval, Direction, Offset
 from vnpy.trader.object import BarData, TickData, OrderData, TradeData
@@ -147,6 +149,20 @@ class CtaTemplate(ABC):
         """
         pass
 
+    @virtual
+    def generate_signal(
+        self,
+        data: Dict[str, np.ndarray]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate whole-array signal for vectorized backtesting.
+
+        Data contains open/high/low/close/volume/turnover/open_interest
+        arrays of all bars, including those loaded for initializing.
+        Return target position (nan for no order) and order price array.
+        """
+        return None
+
     def buy(
         self,
         price: float,
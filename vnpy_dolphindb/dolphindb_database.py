@@ -6,6 +6,7 @@ import dolphindb as ddb
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
+from vnpy.trader.history import BAR_FIELDS, TICK_FIELDS
 from vnpy.trader.database import (
     BaseDatabase,
     BarOverview,
@@ -402,6 +403,98 @@ class DolphindbDatabase(BaseDatabase):
 
         return ticks
 
+    def load_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """读取K线数据DataFrame"""
+        df: pd.DataFrame = self.query_bar_frame(symbol, exchange, interval, start, end)
+
+        df.set_index("datetime", inplace=True)
+        return df.tz_localize(DB_TZ.key)
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取K线数据numpy数组"""
+        df: pd.DataFrame = self.query_bar_frame(symbol, exchange, interval, start, end)
+        return to_arrays(df, BAR_FIELDS)
+
+    def load_tick_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """读取Tick数据DataFrame"""
+        df: pd.DataFrame = self.query_tick_frame(symbol, exchange, start, end)
+
+        df.set_index("datetime", inplace=True)
+        return df.tz_localize(DB_TZ.key)
+
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取Tick数据numpy数组"""
+        df: pd.DataFrame = self.query_tick_frame(symbol, exchange, start, end)
+        return to_arrays(df, TICK_FIELDS)
+
+    def query_bar_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """查询K线数据的时间和数值字段，结果已经是列式存储"""
+        table: ddb.Table = self.session.loadTable(tableName="bar", dbPath=self.db_path)
+
+        df: pd.DataFrame = (
+            table.select(["datetime"] + BAR_FIELDS)
+            .where(f'symbol="{symbol}"')
+            .where(f'exchange="{exchange.value}"')
+            .where(f'interval="{interval.value}"')
+            .where(f'datetime>={convert_time(start)}')
+            .where(f'datetime<={convert_time(end)}')
+            .toDF()
+        )
+        return df
+
+    def query_tick_frame(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """查询Tick数据的时间和数值字段，结果已经是列式存储"""
+        table: ddb.Table = self.session.loadTable(tableName="tick", dbPath=self.db_path)
+
+        df: pd.DataFrame = (
+            table.select(["datetime"] + TICK_FIELDS)
+            .where(f'symbol="{symbol}"')
+            .where(f'exchange="{exchange.value}"')
+            .where(f'datetime>={convert_time(start)}')
+            .where(f'datetime<={convert_time(end)}')
+            .toDF()
+        )
+        return df
+
     def delete_bar_data(
         self,
         symbol: str,
@@ -518,3 +611,19 @@ class DolphindbDatabase(BaseDatabase):
             overviews.append(overview)
 
         return overviews
+
+
+def convert_time(dt: datetime) -> str:
+    """将时间转换为DolphinDB查询语句使用的格式"""
+    return str(np.datetime64(dt)).replace("-", ".")
+
+
+def to_arrays(df: pd.DataFrame, names: list[str]) -> dict[str, np.ndarray]:
+    """将查询结果DataFrame的各列转换为numpy数组"""
+    arrays: dict[str, np.ndarray] = {
+        "datetime": df["datetime"].to_numpy(dtype="datetime64[us]")
+    }
+    for name in names:
+        arrays[name] = df[name].to_numpy(dtype=float)
+
+    return arrays
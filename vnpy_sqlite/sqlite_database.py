@@ -1,6 +1,8 @@
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List
+from typing import Dict, Generator, List
 
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
@@ -16,6 +18,7 @@ from peewee import (
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
+from vnpy.trader.history import BAR_FIELDS, TICK_FIELDS
 from vnpy.trader.utility import get_file_path
 from vnpy.trader.database import (
     BaseDatabase,
@@ -140,6 +143,18 @@ class DbTickOverview(Model):
         indexes: tuple = ((("symbol", "exchange"), True),)
 
 
+# K线数据批量写入使用的字段和SQL语句
+BAR_COLUMNS: List[str] = [
+    "symbol", "exchange", "datetime", "interval", "volume", "turnover", "open_interest",
+    "open_price", "high_price", "low_price", "close_price"
+]
+BAR_INSERT_SQL: str = "INSERT OR REPLACE INTO {} ({}) VALUES ({})".format(
+    DbBarData._meta.table_name,
+    ", ".join(BAR_COLUMNS),
+    ", ".join(["?"] * len(BAR_COLUMNS))
+)
+
+
 class SqliteDatabase(BaseDatabase):
     """SQLite数据库接口"""
 
@@ -149,6 +164,24 @@ class SqliteDatabase(BaseDatabase):
         self.db.connect()
         self.db.create_tables([DbBarData, DbTickData, DbBarOverview, DbTickOverview])
 
+    @contextmanager
+    def bulk_load(self) -> Generator[None, None, None]:
+        """批量导入模式，期间使用WAL日志并降低同步写入频率，退出后恢复原设置"""
+        journal_mode: str = self.db.execute_sql("PRAGMA journal_mode").fetchone()[0]
+        synchronous: int = self.db.execute_sql("PRAGMA synchronous").fetchone()[0]
+        cache_size: int = self.db.execute_sql("PRAGMA cache_size").fetchone()[0]
+
+        self.db.execute_sql("PRAGMA journal_mode=WAL")
+        self.db.execute_sql("PRAGMA synchronous=NORMAL")
+        self.db.execute_sql("PRAGMA cache_size=-262144")
+
+        try:
+            yield
+        finally:
+            self.db.execute_sql(f"PRAGMA cache_size={cache_size}")
+            self.db.execute_sql(f"PRAGMA synchronous={synchronous}")
+            self.db.execute_sql(f"PRAGMA journal_mode={journal_mode}")
+
     def save_bar_data(self, bars: List[BarData], stream: bool = False) -> bool:
         """保存K线数据"""
         # 读取主键参数
@@ -157,23 +190,49 @@ class SqliteDatabase(BaseDatabase):
         exchange: Exchange = bar.exchange
         interval: Interval = bar.interval
 
-        # 将BarData数据转换为字典，并调整时区
-        data: list = []
+        # 将BarData数据转换为元组，并调整时区
+        dts: List[datetime] = [convert_tz(bar.datetime) for bar in bars]
+
+        data: List[tuple] = [
+            (
+                symbol,
+                exchange.value,
+                str(dt),
+                interval.value,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest,
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price
+            )
+            for bar, dt in zip(bars, dts)
+        ]
 
-        for bar in bars:
-            bar.datetime = convert_tz(bar.datetime)
+        # 只统计写入范围内的数据量，用于增量更新汇总数据
+        start: datetime = min(dts)
+        end: datetime = max(dts)
 
-            d: dict = bar.__dict__
-            d["exchange"] = d["exchange"].value
-            d["interval"] = d["interval"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            data.append(d)
+        s: ModelSelect = DbBarData.select().where(
+            (DbBarData.symbol == symbol)
+            & (DbBarData.exchange == exchange.value)
+            & (DbBarData.interval == interval.value)
+            & (DbBarData.datetime >= start)
+            & (DbBarData.datetime <= end)
+        )
 
         # 使用upsert操作将数据更新到数据库中
         with self.db.atomic():
-            for c in chunked(data, 50):
-                DbBarData.insert_many(c).on_conflict_replace().execute()
+            if stream:
+                count: int = len(bars)
+            else:
+                count = -s.count()
+
+            self.db.cursor().executemany(BAR_INSERT_SQL, data)
+
+            if not stream:
+                count += s.count()
 
         # 更新K线汇总数据
         overview: DbBarOverview = DbBarOverview.get_or_none(
@@ -187,22 +246,17 @@ class SqliteDatabase(BaseDatabase):
             overview.symbol = symbol
             overview.exchange = exchange.value
             overview.interval = interval.value
-            overview.start = bars[0].datetime
-            overview.end = bars[-1].datetime
-            overview.count = len(bars)
-        elif stream:
-            overview.end = bars[-1].datetime
-            overview.count += len(bars)
-        else:
-            overview.start = min(bars[0].datetime, overview.start)
-            overview.end = max(bars[-1].datetime, overview.end)
-
-            s: ModelSelect = DbBarData.select().where(
+            overview.start = start
+            overview.end = end
+            overview.count = DbBarData.select().where(
                 (DbBarData.symbol == symbol)
                 & (DbBarData.exchange == exchange.value)
                 & (DbBarData.interval == interval.value)
-            )
-            overview.count = s.count()
+            ).count()
+        else:
+            overview.start = min(start, overview.start)
+            overview.end = max(end, overview.end)
+            overview.count += count
 
         overview.save()
 
@@ -271,8 +325,54 @@ class SqliteDatabase(BaseDatabase):
         end: datetime
     ) -> List[BarData]:
         """读取K线数据"""
+        rows: List[tuple] = self.query_bar_rows(symbol, exchange, interval, start, end)
+
+        bars: List[BarData] = []
+        for dt, open_price, high_price, low_price, close_price, volume, turnover, open_interest in rows:
+            bar: BarData = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=datetime.fromisoformat(dt).replace(tzinfo=DB_TZ),
+                interval=interval,
+                volume=volume,
+                turnover=turnover,
+                open_interest=open_interest,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                gateway_name="DB"
+            )
+            bars.append(bar)
+
+        return bars
+
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """读取K线数据，直接转换为numpy数组，不创建BarData对象"""
+        rows: List[tuple] = self.query_bar_rows(symbol, exchange, interval, start, end)
+        return to_arrays(rows, BAR_FIELDS)
+
+    def query_bar_rows(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> List[tuple]:
+        """使用原始游标查询K线数据，时间为字符串，其他字段顺序同BAR_FIELDS"""
         s: ModelSelect = (
-            DbBarData.select().where(
+            DbBarData.select(
+                DbBarData.datetime,
+                *[getattr(DbBarData, name) for name in BAR_FIELDS]
+            ).where(
                 (DbBarData.symbol == symbol)
                 & (DbBarData.exchange == exchange.value)
                 & (DbBarData.interval == interval.value)
@@ -281,25 +381,9 @@ class SqliteDatabase(BaseDatabase):
             ).order_by(DbBarData.datetime)
         )
 
-        bars: List[BarData] = []
-        for db_bar in s:
-            bar: BarData = BarData(
-                symbol=db_bar.symbol,
-                exchange=Exchange(db_bar.exchange),
-                datetime=datetime.fromtimestamp(db_bar.datetime.timestamp(), DB_TZ),
-                interval=Interval(db_bar.interval),
-                volume=db_bar.volume,
-                turnover=db_bar.turnover,
-                open_interest=db_bar.open_interest,
-                open_price=db_bar.open_price,
-                high_price=db_bar.high_price,
-                low_price=db_bar.low_price,
-                close_price=db_bar.close_price,
-                gateway_name="DB"
-            )
-            bars.append(bar)
-
-        return bars
+        # 跳过peewee的模型创建和字段类型转换
+        sql, params = s.sql()
+        return self.db.execute_sql(sql, params).fetchall()
 
     def load_tick_data(
         self,
@@ -363,6 +447,30 @@ class SqliteDatabase(BaseDatabase):
 
         return ticks
 
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, np.ndarray]:
+        """读取TICK数据，直接转换为numpy数组，不创建TickData对象"""
+        s: ModelSelect = (
+            DbTickData.select(
+                DbTickData.datetime,
+                *[getattr(DbTickData, name) for name in TICK_FIELDS]
+            ).where(
+                (DbTickData.symbol == symbol)
+                & (DbTickData.exchange == exchange.value)
+                & (DbTickData.datetime >= start)
+                & (DbTickData.datetime <= end)
+            ).order_by(DbTickData.datetime)
+        )
+
+        sql, params = s.sql()
+        rows: List[tuple] = self.db.execute_sql(sql, params).fetchall()
+        return to_arrays(rows, TICK_FIELDS)
+
     def delete_bar_data(
         self,
         symbol: str,
@@ -480,3 +588,19 @@ class SqliteDatabase(BaseDatabase):
             overview.end = end_bar.datetime
 
             overview.save()
+
+
+def to_arrays(rows: List[tuple], names: List[str]) -> Dict[str, np.ndarray]:
+    """将查询结果转换为numpy数组，第一列为时间字符串，空值转换为nan"""
+    if rows:
+        columns: list = list(zip(*rows))
+    else:
+        columns = [()] * (len(names) + 1)
+
+    arrays: Dict[str, np.ndarray] = {
+        "datetime": np.array(columns[0], dtype="datetime64[us]")
+    }
+    for name, column in zip(names, columns[1:]):
+        arrays[name] = np.array(column, dtype=float)
+
+    return arrays